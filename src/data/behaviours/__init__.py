@@ -14,7 +14,9 @@ the engine package and expose itself in this __init__ file.
 A script can be used to automate adding new Behaviours.
 """
 # expose classes in modules for easy access
+from behaviours.renderer import Renderer
 from behaviours.boxrenderer import BoxRenderer
 from behaviours.sphererenderer import CircleRenderer
 from behaviours.textrenderer import TextRenderer
+from behaviours.spriterenderer import SpriteRenderer
 
@@ -3,45 +3,75 @@ This module contains the BoxRenderer Behaviour.
 """
 import pygame
 
-from engine import Behaviour
-from engine import ComponentError
+from behaviours.renderer import Renderer
 
-from components import Transform
-import engine.vars as gvars
 
-
-class BoxRenderer(Behaviour):
+class BoxRenderer(Renderer):
     """
     The BoxRenderer renders, as the name implies, a simple rectangle with
     dimensions 'width' and 'height' on the screen at the position of the
     Transform attached to the same GameObject with color 'color'.
+
+    The rectangle is rasterized again only when 'width', 'height' or 'color'
+    change, and BoxRenderers that look the same share the same Surface.
     """
-    
-    def __init__(self, enabled=True, width=0, height=0, color=(255, 255, 255)):
+
+    __slots__ = ('_width', '_height', '_color')
+
+    def __init__(self, enabled=True, width=0, height=0, color=(255, 255, 255),
+                 layer=0):
         """
         Constructor for BoxRenderer. Takes in a bool that specifies if
         the component should be enabled ('enabled'), the dimensions of the
-        rectangle ('width' and 'height') and a tuple with the RGB values of the
-        color.
+        rectangle ('width' and 'height'), a tuple with the RGB values of the
+        color and the layer on which it draws ('layer').
         """
-        super().__init__(enabled)
-        self.width = width
-        self.height = height
-        self.color = color[:]
-        self.surface = pygame.Surface((self.width, self.height))
-        self.transform = None
-        
-    def on_attach(self):
-        """Get a reference to the GameObject's transform"""
-        self.transform = self.gameobject.get_component(Transform)
-        if not self.transform:
-            raise ComponentError('Cannot find Transform attached to GameObject',
-                                 self)
-        
-    def on_behaviour_update(self):
-        """Draw the rectangle on the screen"""
-        self.surface.fill(gvars.FLUSH_COLOR)
-
-        rect = [0, 0, self.width, self.height]
-        pygame.draw.rect(self.surface, self.color, rect)
-        gvars.SCREEN.blit(self.surface, self.transform.absolute_pos)
+        super().__init__(enabled, layer)
+        self._width = width
+        self._height = height
+        self._color = tuple(color)
+
+    @property
+    def width(self):
+        """Width of the rectangle"""
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        if value != self._width:
+            self._width = value
+            self._invalidate()
+
+    @property
+    def height(self):
+        """Height of the rectangle"""
+        return self._height
+
+    @height.setter
+    def height(self, value):
+        if value != self._height:
+            self._height = value
+            self._invalidate()
+
+    @property
+    def color(self):
+        """RGB color of the rectangle"""
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        value = tuple(value)
+        if value != self._color:
+            self._color = value
+            self._invalidate()
+
+    def _rasterize(self):
+        """Return the shared Surface filled with the rectangle's color"""
+        key = (BoxRenderer, self._width, self._height, self._color)
+        return self._pooled(key, self._draw)
+
+    def _draw(self):
+        """Return an opaque Surface filled with the rectangle's color"""
+        surface = pygame.Surface((self._width, self._height))
+        surface.fill(self._color)
+        return surface
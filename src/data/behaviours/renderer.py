@@ -0,0 +1,155 @@
+"""
+This module contains the Renderer Behaviour, base of every Behaviour that
+draws something on the screen.
+"""
+from engine import Behaviour
+from engine import ComponentError
+from engine.assets import SurfacePool
+
+from components import Transform
+import engine.camera
+import engine.render
+import engine.vars as gvars
+
+
+class Renderer(Behaviour):
+    """
+    A Renderer draws a Surface on the screen at the position of the Transform
+    attached to the same GameObject. The Surface is submitted to the engine
+    (see engine.render module), that draws it at the end of the frame on the
+    layer 'layer': Renderers on higher layers are drawn on top of the ones on
+    lower layers.
+
+    A Renderer keeps its bounds in the spatial index of the engine.camera
+    module and doesn't submit anything while it is out of the view of the
+    active Camera, unless its layer is static.
+
+    On a static layer the Renderer doesn't submit its Surface every frame: it
+    places it in the composite of the layer (see engine.render.static_layer())
+    and places it again only when it moves or changes. It withdraws it when
+    it is disabled, despawned or detached.
+
+    The Surface is rasterized only when needed and then kept: at every update
+    the Renderer just submits it. Children have to override _rasterize(), that
+    returns the new Surface, and call _invalidate() every time one of the
+    properties that change the pixels of the Surface changes. The new Surface
+    will be rasterized at the next update.
+
+    Renderers whose Surface depends only on a few parameters should share it
+    with the identical ones: _rasterize() returns _pooled(key, rasterize),
+    where 'key' contains all the parameters. The Surface comes from the
+    SurfacePool (see engine.assets) and must never be modified: changing a
+    parameter invalidates the Surface, which releases it, and a different one
+    is acquired at the next update (copy-on-write). The Surface is released
+    on detach too.
+
+    The Renderer itself should not be used: every renderer inherits from it.
+    """
+
+    __slots__ = ('layer', 'transform', '_surface', '_bounds', '_pool_key',
+                 '_placed')
+
+    def __init__(self, enabled=True, layer=0):
+        """
+        Constructor for Renderer. Takes in a bool that specifies if the
+        component should be enabled ('enabled') and the number of the layer
+        on which it draws ('layer').
+        """
+        super().__init__(enabled)
+        self.layer = layer
+        self.transform = None
+        self._surface = None
+        self._bounds = None
+        self._pool_key = None
+        self._placed = None
+
+    @property
+    def surface(self):
+        """The rasterized Surface, rasterized again if it was invalidated"""
+        if self._surface is None:
+            self._surface = self._rasterize()
+        return self._surface
+
+    def on_attach(self):
+        """Get a reference to the GameObject's transform"""
+        self.transform = self.gameobject.get_component(Transform)
+        if not self.transform:
+            raise ComponentError('Cannot find Transform attached to GameObject',
+                                 self)
+
+    def on_component_update(self):
+        """Withdraw from the static layer while disabled, then update"""
+        if not self.enabled and self._placed is not None:
+            self._withdraw()
+        super().on_component_update()
+
+    def on_behaviour_update(self):
+        """
+        Submit the Surface to be drawn on the screen, if in view, or place it
+        in the static layer if it moved or changed
+        """
+        surface = self.surface
+        pos = self.transform.absolute_pos
+        static = engine.render.static_layer(self.layer)
+        if static is not None:
+            placed = (static, surface, pos[0], pos[1])
+            if placed != self._placed:
+                if self._placed is not None and self._placed[0] is not static:
+                    self._withdraw()
+                static.place(self, surface, pos)
+                self._placed = placed
+            return
+        if self._placed is not None:
+            self._withdraw()
+        camera = gvars.CAMERA
+        if camera is not None:
+            bounds = (pos[0], pos[1], surface.get_width(),
+                      surface.get_height())
+            if bounds != self._bounds:
+                self._bounds = bounds
+                engine.camera.index.update(self, bounds)
+                if not camera.sees(bounds):
+                    return
+            elif self not in camera.visible:
+                return
+        engine.render.submit(surface, pos, self.layer)
+
+    def on_despawn(self):
+        """Withdraw from the static layer"""
+        self._withdraw()
+
+    def on_detach(self, forced=False):
+        """
+        Remove the bounds from the spatial index, withdraw from the static
+        layer and release the Surface
+        """
+        engine.camera.index.remove(self)
+        self._bounds = None
+        self._withdraw()
+        self._invalidate()
+
+    def _withdraw(self):
+        """Remove the Surface from the static layer, if placed"""
+        if self._placed is not None:
+            self._placed[0].withdraw(self)
+            self._placed = None
+
+    def _invalidate(self):
+        """Throw away the Surface: it will be rasterized at next update"""
+        self._surface = None
+        if self._pool_key is not None:
+            SurfacePool.release(self._pool_key)
+            self._pool_key = None
+
+    def _pooled(self, key, rasterize):
+        """
+        Return the Surface with key 'key' from the SurfacePool. 'rasterize' is
+        called to create it only if no other Renderer is using it.
+        """
+        surface = SurfacePool.acquire(key, rasterize)
+        self._pool_key = key
+        return surface
+
+    def _rasterize(self):
+        """Return a new Surface with the pixels to draw"""
+        raise NotImplementedError
@@ -1,47 +1,69 @@
 """
-This module contains the BoxRenderer Behaviour.
+This module contains the CircleRenderer Behaviour.
 """
 import pygame
 
-from engine import Behaviour
-from engine import ComponentError
+from behaviours.renderer import Renderer
 
-from components import Transform
-import engine.vars as gvars
 
-
-class CircleRenderer(Behaviour):
+class CircleRenderer(Renderer):
     """
     The CircleRenderer renders, as the name implies, a simple circle with
     radius 'radius' on the screen at the position of the Transform attached to
     the same GameObject with color 'color'.
+
+    The circle is rasterized again only when 'radius' or 'color' change, and
+    CircleRenderers that look the same share the same Surface. The area
+    around the circle is transparent (per-pixel alpha), so it doesn't cover
+    what is below it.
     """
-    
-    def __init__(self, enabled=True, radius=0, color=(255, 255, 255)):
+
+    __slots__ = ('_radius', '_color')
+
+    def __init__(self, enabled=True, radius=0, color=(255, 255, 255),
+                 layer=0):
         """
         Constructor for CircleRenderer. Takes in a bool that specifies if
         the component should be enabled ('enabled'), the radius of the circle
-        ('radius') and a tuple with the RGB values of the color.
+        ('radius'), a tuple with the RGB values of the color and the layer on
+        which it draws ('layer').
         """
-        super().__init__(enabled)
-        self.radius = radius
-        self.color = color[:]
-        self.surface = pygame.Surface((self.radius * 2, self.radius * 2))
-
-        self.transform = None
-
-    def on_attach(self):
-        """Get a reference to the GameObject's transform"""
-        self.transform = self.gameobject.get_component(Transform)
-        if not self.transform:
-            raise ComponentError('Cannot find Transform attached to GameObject',
-                                 self)
-        
-    def on_behaviour_update(self):
-        """Draw the circle on the screen"""
-        self.surface.fill(gvars.FLUSH_COLOR)
-        
-        pos = [self.radius, self.radius]
-        pygame.draw.circle(self.surface, self.color, pos, self.radius)
-        
-        gvars.SCREEN.blit(self.surface, self.transform.absolute_pos)
+        super().__init__(enabled, layer)
+        self._radius = radius
+        self._color = tuple(color)
+
+    @property
+    def radius(self):
+        """Radius of the circle"""
+        return self._radius
+
+    @radius.setter
+    def radius(self, value):
+        if value != self._radius:
+            self._radius = value
+            self._invalidate()
+
+    @property
+    def color(self):
+        """RGB color of the circle"""
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        value = tuple(value)
+        if value != self._color:
+            self._color = value
+            self._invalidate()
+
+    def _rasterize(self):
+        """Return the shared Surface with the circle drawn on it"""
+        key = (CircleRenderer, self._radius, self._color)
+        return self._pooled(key, self._draw)
+
+    def _draw(self):
+        """Return a transparent Surface with the circle drawn on it"""
+        size = (self._radius * 2, self._radius * 2)
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        pos = [self._radius, self._radius]
+        pygame.draw.circle(surface, self._color, pos, self._radius)
+        return surface
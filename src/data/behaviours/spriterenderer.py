@@ -0,0 +1,99 @@
+"""
+This module contains the SpriteRenderer Behaviour.
+"""
+from engine.assets import AtlasCache
+from engine.assets import ImageCache
+
+from behaviours.renderer import Renderer
+
+
+class SpriteRenderer(Renderer):
+    """
+    The SpriteRenderer renders, as the name implies, an image 'image' on the
+    screen at the position of the Transform attached to the same GameObject.
+
+    If 'frame' is passed, only that frame of a texture atlas is rendered (see
+    engine.assets.Atlas): 'image' is then either the path of the YAML file
+    describing the atlas, or the path of a sprite sheet whose frames have all
+    the size 'frame_size'.
+
+    Images and atlases come from the engine-wide caches (see engine.assets):
+    they are loaded once, converted to the display format and shared by every
+    SpriteRenderer that uses them, even across Scenes.
+    """
+
+    __slots__ = ('_image', '_frame', '_frame_size', '_asset')
+
+    def __init__(self, enabled=True, image='', frame=None, frame_size=None,
+                 layer=0):
+        """
+        Constructor for SpriteRenderer. Takes in a bool that specifies if
+        the component should be enabled ('enabled'), the path of the image,
+        relative to the game directory ('image'), the key of the frame to
+        render ('frame'), the size of the frames of a sprite sheet as
+        [width, height] ('frame_size') and the layer on which it draws
+        ('layer').
+        """
+        super().__init__(enabled, layer)
+        self._image = image
+        self._frame = frame
+        self._frame_size = tuple(frame_size) if frame_size else None
+        self._asset = None
+
+    @property
+    def image(self):
+        """Path of the image or of the atlas"""
+        return self._image
+
+    @image.setter
+    def image(self, value):
+        if value != self._image:
+            self._release()
+            self._image = value
+            self._invalidate()
+
+    @property
+    def frame(self):
+        """Key of the rendered frame of the atlas, None for the whole image"""
+        return self._frame
+
+    @frame.setter
+    def frame(self, value):
+        if value == self._frame:
+            return
+        if (value is None) != (self._frame is None):
+            self._release()
+        self._frame = value
+        self._invalidate()
+
+    def on_detach(self, forced=False):
+        """Stop using the image"""
+        super().on_detach(forced)
+        self._release()
+        self._invalidate()
+
+    def _rasterize(self):
+        """Return the image or the frame of the atlas"""
+        if self._asset is None:
+            self._acquire()
+        asset = self._asset[2]
+        if self._frame is None:
+            return asset
+        return asset.frame(self._frame)
+
+    def _acquire(self):
+        """Internal use: get the image or the atlas from its cache"""
+        if self._frame is None:
+            cache, key = ImageCache, self._image
+        elif self._frame_size is not None:
+            cache, key = AtlasCache, (self._image, self._frame_size)
+        else:
+            cache, key = AtlasCache, self._image
+        self._asset = (cache, key, cache.acquire(key))
+
+    def _release(self):
+        """Internal use: stop using the image or the atlas, if in use"""
+        if self._asset is not None:
+            cache, key, _ = self._asset
+            cache.release(key)
+            self._asset = None
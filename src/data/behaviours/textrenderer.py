@@ -1,55 +1,96 @@
 """
 This module contains the TextRenderer Behaviour.
 """
-import pygame
+from engine.assets import FontCache
+from engine.assets import TextCache
 
-from engine import Behaviour
-from engine import ComponentError
+from behaviours.renderer import Renderer
 
-from components import Transform
-import engine.vars as gvars
 
-
-class TextRenderer(Behaviour):
+class TextRenderer(Renderer):
     """
     The TextRenderer renders, as the name implies, some text 'text' with
     size 'size' on the screen at the position of the Transform attached to
     the same GameObject with color 'color'.
+
+    Fonts and rendered text come from the engine-wide caches (see
+    engine.assets), so the text is rendered again only when 'text', 'size',
+    'color' or 'antialias' change, and identical labels share one Surface.
     """
-    
-    def __init__(self, enabled=True, size=0, color=(0, 0, 0), text=''):
+
+    __slots__ = ('_size', '_color', '_text', '_antialias')
+
+    def __init__(self, enabled=True, size=0, color=(0, 0, 0), text='',
+                 antialias=True, layer=0):
         """
         Constructor for TextRenderer. Takes in a bool that specifies if
         the component should be enabled ('enabled'), the size of the text
-        ('size'), a tuple with the RGB values of its color ('color') and
-        a string containing the text that will be rendered.
+        ('size'), a tuple with the RGB values of its color ('color'),
+        a string containing the text that will be rendered, a bool that
+        specifies if the text should be antialiased ('antialias') and the
+        layer on which it draws ('layer').
         """
-        super().__init__(enabled)
-        self.size = size
-        self.color = color
-        self.text = text
-        
-        self.font = pygame.font.Font(None, self.size)
-        self.rendered_text = None
-
-        self.transform = None
-        
-    def on_attach(self):
-        """Get a reference to the GameObject's transform"""
-        self.transform = self.gameobject.get_component(Transform)
-        if not self.transform:
-            raise ComponentError('Cannot find Transform attached to GameObject',
-                                 self)
-        
-    def on_behaviour_update(self):
-        """Draw the text on the screen"""
-        if self.rendered_text:
-            self.rendered_text.fill(gvars.FLUSH_COLOR)
-
-        self.rendered_text = self.font.render(self.text, True, self.color)
-        gvars.SCREEN.blit(self.rendered_text, self.transform.absolute_pos)
+        super().__init__(enabled, layer)
+        self._size = size
+        self._color = tuple(color)
+        self._text = text
+        self._antialias = antialias
+
+    @property
+    def text(self):
+        """The rendered text"""
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        if value != self._text:
+            self._text = value
+            self._invalidate()
+
+    @property
+    def size(self):
+        """Size of the font"""
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        if value != self._size:
+            self._size = value
+            self._invalidate()
+
+    @property
+    def color(self):
+        """RGB color of the text"""
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        value = tuple(value)
+        if value != self._color:
+            self._color = value
+            self._invalidate()
+
+    @property
+    def antialias(self):
+        """True if the text is antialiased"""
+        return self._antialias
+
+    @antialias.setter
+    def antialias(self, value):
+        if value != self._antialias:
+            self._antialias = value
+            self._invalidate()
+
+    @property
+    def font(self):
+        """The Font used to render the text"""
+        return FontCache.get(None, self._size)
 
     def change_size(self, new_size):
         """Change the size of the font"""
         self.size = new_size
-        self.font = pygame.font.Font(None, self.size)
+
+    def _rasterize(self):
+        """Return the Surface with the rendered text"""
+        return TextCache.render(self._text, self._size, self._color,
+                                self._antialias)
@@ -0,0 +1,452 @@
+"""
+Module containing some benchmarks that measure the engine without the main
+loop running. Every benchmark returns its results in a dictionary, so they can
+be compared between two versions of the engine.
+
+The hot paths of the engine are measured on synthetic scenes (see
+write_scene()) of every size in SIZES, both flat (no parents) and deep (chains
+of DEPTH GameObjects, each the parent of the next one): scene loading,
+GameObject creation and destruction, event dispatch, lookups and the cost of
+Transforms and Renderers in a frame. Every result is a time or a size, so
+lower is always better.
+
+Usage: python benchmarks.py [-s SIZE ...] [--save [PATH]] [--compare [PATH]]
+
+Executing the module directly runs every benchmark and prints the results as
+JSON. With --save, the results are stored as the baseline; with --compare,
+they are compared with the stored baseline and the script exits with code 1
+if any result is more than TOLERANCE worse than it. No baseline is shipped,
+since the results depend on the machine: run once with --save before
+comparing (--compare without a baseline only prints a note).
+"""
+import argparse
+from contextlib import contextmanager
+import gc
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pygame
+
+import engine
+import components
+import behaviours
+
+SIZES = (100, 1000, 10000, 50000)
+DEPTH = 100
+TOLERANCE = 0.25
+BASELINE_PATH = pathlib.Path(__file__).with_name('benchmarks_baseline.json')
+
+
+class _BenchComponent(engine.Component):
+    """Empty Component used to measure the cost of a Component alone"""
+
+    __slots__ = ()
+
+
+def _traced_size(function):
+    """
+    Return the number of bytes allocated (and still alive) by calling
+    'function' and its return value, which has to be kept alive.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep_alive = function()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep_alive
+    return after - before
+
+
+def _create_gameobjects(count, extra_components):
+    """
+    Create 'count' GameObjects in a new current Scene, each with a Transform
+    and 'extra_components' empty Components, and return them.
+    """
+    engine.vars.current_scene = engine.Scene('Benchmark')
+    gos = []
+    for i in range(count):
+        comps = [components.Transform()]
+        comps.extend(_BenchComponent() for _ in range(extra_components))
+        gos.append(engine.GameObject(f'Bench{i}', comps))
+    return gos
+
+
+def _clear_scene():
+    """Destroy the Scene created by the benchmark"""
+    engine.sceneloader.destroy_current()
+
+
+def bench_memory(count=500, extra_components=4):
+    """
+    Measure the memory held by 'count' GameObjects with a Transform each,
+    event Listeners and EventHandlers included.
+
+    Return a dictionary with the bytes per GameObject (with its Transform) and
+    the bytes per additional Component attached.
+    """
+    base = _traced_size(lambda: _create_gameobjects(count, 0))
+    _clear_scene()
+    full = _traced_size(lambda: _create_gameobjects(count, extra_components))
+    _clear_scene()
+    return {'bytes_per_gameobject': base / count,
+            'bytes_per_component': (full - base) / (count * extra_components)}
+
+
+def _noop(*args):
+    """Callback that does nothing, used to measure the event dispatch alone"""
+    pass
+
+
+def _best_time(function, repeat=3):
+    """Return the seconds of the fastest of 'repeat' calls of 'function'"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def scene_data(count, depth=0, renderers=True):
+    """
+    Return the raw scene data of a scene with 'count' spawned GameObjects,
+    each with a Transform and, if 'renderers' is True, a BoxRenderer. If
+    'depth' is not 0, the GameObjects form chains 'depth' long: each one is
+    the parent of the next one.
+    """
+    data = []
+    for i in range(count):
+        transform = {'type': 'Transform', 'x': i % 600, 'y': i // 600}
+        if depth and i % depth:
+            transform['parent'] = f'Bench{i - 1}'
+        comps = [transform]
+        if renderers:
+            comps.append({'type': 'BoxRenderer', 'width': 4, 'height': 4,
+                          'color': [255, 255, 255]})
+        data.append({'name': f'Bench{i}', 'spawned': True,
+                     'components': comps})
+    return data
+
+
+def write_scene(path, name, count, depth=0, renderers=True):
+    """
+    Write in the folder 'path' the scene file of a scene 'name' with the
+    GameObjects of scene_data().
+    """
+    lines = ['---']
+    for raw_go in scene_data(count, depth, renderers):
+        lines.extend([f"- name: '{raw_go['name']}'",
+                      '  spawned: true',
+                      '  components:'])
+        for raw_comp in raw_go['components']:
+            first = True
+            for key, value in raw_comp.items():
+                value = f"'{value}'" if key == 'parent' else value
+                lines.append(f"    {'- ' if first else '  '}{key}: {value}")
+                first = False
+    pathlib.Path(path).joinpath(f'{name}.yaml').write_text('\n'.join(lines))
+
+
+@contextmanager
+def _scene_folder():
+    """Use a temporary folder as SCENE_PATH and yield its path"""
+    old_path = engine.vars.SCENE_PATH
+    with tempfile.TemporaryDirectory() as folder:
+        engine.vars.SCENE_PATH = pathlib.Path(folder)
+        try:
+            yield folder
+        finally:
+            engine.vars.SCENE_PATH = old_path
+
+
+def _load_synthetic(count, depth=0, renderers=True):
+    """
+    Load a synthetic scene (see scene_data()) straight from its data, without
+    writing and parsing its YAML file, and return it.
+    """
+    name = f'bench_{count}_{depth}_{renderers}'
+    compiled = engine.sceneloader.compile_scene(
+        name, scene_data(count, depth, renderers))
+    engine.sceneloader.SceneCache.add(name, compiled)
+    engine.sceneloader.load_scene(name)
+    engine.sceneloader.SceneCache.remove(name)
+    return engine.vars.current_scene
+
+
+def bench_scene_formats(count=10000):
+    """
+    Measure how long it takes to get the CompiledScene of a scene with 'count'
+    GameObjects from its YAML file and from its compiled file (the SceneCache
+    is not used).
+
+    Return a dictionary with the seconds taken by each.
+    """
+    with _scene_folder() as folder:
+        write_scene(folder, 'bench', count)
+        start = time.perf_counter()
+        compiled = engine.sceneloader.compile_scene(
+            'bench', engine.sceneloader.load_raw_data('bench'))
+        yaml_time = time.perf_counter() - start
+        engine.sceneloader.write_compiled(compiled)
+        start = time.perf_counter()
+        compiled = engine.sceneloader.read_compiled('bench')
+        compiled_time = time.perf_counter() - start
+        assert len(compiled.gameobjects) == count
+    return {'yaml_seconds': yaml_time, 'compiled_seconds': compiled_time}
+
+
+def bench_import_time(module='main', runs=5):
+    """
+    Measure the cold start of 'module': import it 'runs' times, each in a new
+    interpreter started with '-X importtime', and keep the fastest run.
+
+    Return a dictionary with the milliseconds taken by the import of 'module'
+    and by the heaviest packages it imports ('pygame', 'ruamel.yaml' and
+    'engine'; 0 if not imported).
+    """
+    tracked = (module, 'pygame', 'ruamel.yaml', 'engine')
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                                 f'import {module}'],
+                                cwd=pathlib.Path(__file__).parent,
+                                capture_output=True, text=True, check=True)
+        times = dict.fromkeys(tracked, 0)
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, cumulative, name = line.split('|')
+            name = name.strip()
+            if name in times and cumulative.strip().isdigit():
+                times[name] = int(cumulative) / 1000
+        if best is None or times[module] < best[module]:
+            best = times
+    return {f'{name}_ms': value for name, value in best.items()}
+
+
+def bench_scene_load(count, depth=0):
+    """
+    Measure how long it takes to load a synthetic scene with 'count'
+    GameObjects (see scene_data()) from its YAML file (cold, the SceneCache
+    is empty) and from the SceneCache (cached). The previous scene is
+    destroyed before starting each measure.
+
+    Return a dictionary with the seconds taken by each load.
+    """
+    results = {}
+    with _scene_folder() as folder:
+        write_scene(folder, 'bench', count, depth)
+        engine.sceneloader.SceneCache.clear()
+        for key in ('cold_seconds', 'cached_seconds'):
+            engine.sceneloader.destroy_current()
+            start = time.perf_counter()
+            engine.sceneloader.load_scene('bench')
+            results[key] = time.perf_counter() - start
+            assert len(engine.vars.current_scene.gameobjects) == count
+        engine.sceneloader.destroy_current()
+        engine.sceneloader.SceneCache.clear()
+    return results
+
+
+def bench_lifecycle(count):
+    """
+    Measure the creation (spawn included) and the destruction of 'count'
+    GameObjects with a Transform each.
+
+    Return a dictionary with the microseconds taken by each GameObject.
+    """
+    start = time.perf_counter()
+    for gobj in _create_gameobjects(count, 0):
+        gobj.spawn()
+    create_time = time.perf_counter() - start
+    start = time.perf_counter()
+    _clear_scene()
+    destroy_time = time.perf_counter() - start
+    return {'create_us': create_time * 1e6 / count,
+            'destroy_us': destroy_time * 1e6 / count}
+
+
+def bench_dispatch(count, frames=10):
+    """
+    Measure the event dispatch of a frame: launching an event listened to by
+    'count' Listeners (launch()) and a GameObjectEvent to each of 'count'
+    GameObjects with a Transform (launch_go()).
+
+    Return a dictionary with the milliseconds per frame taken by each.
+    """
+    source = engine.eventsys.source
+    listener_cls = engine.eventsys.GameEventListener
+    listeners = [listener_cls(engine.eventsys.EventHandler(_noop, i),
+                              listener_cls.ACTIVE, force=True)
+                 for i in range(count)]
+    for listener in listeners:
+        listener.listen()
+    launch_time = _best_time(lambda: source.launch(listener_cls.ACTIVE,
+                                                   listener_cls))
+    for listener in listeners:
+        listener.ignore()
+
+    ids = [gobj.gobj_id for gobj in _create_gameobjects(count, 0)]
+    update = engine.eventsys.GameObjectEventListener.UPDATE
+
+    def frame():
+        for _ in range(frames):
+            for gobj_id in ids:
+                source.launch_go(update, gobj_id)
+    launch_go_time = _best_time(frame) / frames
+    _clear_scene()
+    return {'launch_ms': launch_time * 1000,
+            'launch_go_ms': launch_go_time * 1000}
+
+
+def bench_lookup(count, calls=100):
+    """
+    Measure the lookups in a Scene with 'count' GameObjects, each with a
+    Transform: GameObject.find() by name and by id of the last GameObject and
+    get_component() of a Component attached and of one that isn't.
+
+    Return a dictionary with the microseconds taken by each call.
+    """
+    last = _create_gameobjects(count, 0)[-1]
+    find = engine.GameObject.find
+    lookups = {'find_name_us': lambda: find(last.name),
+               'find_id_us': lambda: find(last.gobj_id),
+               'get_component_us':
+                   lambda: last.get_component(components.Transform),
+               'get_component_missing_us':
+                   lambda: last.get_component(_BenchComponent)}
+    results = {}
+    for key, lookup in lookups.items():
+        def calls_lookup():
+            for _ in range(calls):
+                lookup()
+        results[key] = _best_time(calls_lookup) * 1e6 / calls
+    _clear_scene()
+    return results
+
+
+def bench_frame(count, depth=0, frames=10):
+    """
+    Measure the update of a synthetic scene (see scene_data()) with 'count'
+    GameObjects: the Transforms alone (with 'depth', their propagation down
+    the hierarchy), the updates of the BoxRenderers alone and the drawing of
+    what they submitted (engine.render.flush()) on an off-screen Surface.
+
+    Return a dictionary with the milliseconds per frame taken by each.
+    """
+    screen = pygame.Surface((600, 400))
+
+    def frame():
+        for _ in range(frames):
+            engine.vars.current_scene.update()
+            engine.render.flush(screen)
+
+    def render_frames():
+        elapsed = 0
+        for _ in range(frames):
+            start = time.perf_counter()
+            for renderer in renderers:
+                renderer.on_component_update()
+            elapsed += time.perf_counter() - start
+            engine.render.flush(screen)
+        return elapsed
+    _load_synthetic(count, depth, renderers=False)
+    transform_time = _best_time(frame) / frames
+    scene = _load_synthetic(count, depth, renderers=True)
+    renderers = [gobj.get_component(behaviours.BoxRenderer)
+                 for gobj in scene.gameobjects.values()]
+    frame()  # Rasterize the Surfaces first
+    renderer_time = min(render_frames() for _ in range(3)) / frames
+    engine.vars.current_scene.update()
+    flush_time = _best_time(lambda: engine.render.flush(screen), 1)
+    engine.sceneloader.destroy_current()
+    return {'transform_ms': transform_time * 1000,
+            'renderer_ms': renderer_time * 1000,
+            'flush_ms': flush_time * 1000}
+
+
+def run_hot_paths(sizes=SIZES):
+    """
+    Run the hot path benchmarks for every size in 'sizes', with flat and deep
+    scenes where the hierarchy matters. Return a dictionary with their
+    results, named '<benchmark>.<shape>.<size>'.
+    """
+    results = {}
+    for size in sizes:
+        results[f'lifecycle.{size}'] = bench_lifecycle(size)
+        results[f'dispatch.{size}'] = bench_dispatch(size)
+        results[f'lookup.{size}'] = bench_lookup(size)
+        for shape, depth in (('flat', 0), ('deep', DEPTH)):
+            results[f'scene_load.{shape}.{size}'] = \
+                bench_scene_load(size, depth)
+            results[f'frame.{shape}.{size}'] = bench_frame(size, depth)
+    return results
+
+
+def run_all(sizes=SIZES):
+    """Run every benchmark and return a dictionary with their results"""
+    results = {'memory': bench_memory(),
+               'scene_formats': bench_scene_formats(),
+               'import_time': bench_import_time()}
+    results.update(run_hot_paths(sizes))
+    return results
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Store 'results' as the baseline in the JSON file at 'path'"""
+    pathlib.Path(path).write_text(json.dumps(results, indent=2,
+                                             sort_keys=True))
+
+
+def compare(results, path=BASELINE_PATH, tolerance=TOLERANCE):
+    """
+    Compare 'results' with the baseline stored at 'path'. Return a list with
+    a tuple (benchmark, key, baseline value, value) for every result more
+    than 'tolerance' (a fraction) worse than the baseline. Results missing
+    from either are not compared. Raise FileNotFoundError if there is no
+    baseline at 'path' (see save_baseline()).
+    """
+    baseline = json.loads(pathlib.Path(path).read_text())
+    regressions = []
+    for name, values in results.items():
+        for key, value in values.items():
+            old = baseline.get(name, {}).get(key)
+            if old is not None and value > old * (1 + tolerance):
+                regressions.append((name, key, old, value))
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the engine.')
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=SIZES,
+                        metavar='SIZE', help='number of GameObjects of the '
+                        'synthetic scenes (default: %(default)s)')
+    parser.add_argument('--save', nargs='?', const=BASELINE_PATH,
+                        metavar='PATH', help='store the results as baseline')
+    parser.add_argument('--compare', nargs='?', const=BASELINE_PATH,
+                        metavar='PATH', help='compare the results with the '
+                        'baseline')
+    args = parser.parse_args()
+    all_results = run_all(args.sizes)
+    print(json.dumps(all_results, indent=2))
+    if args.save:
+        save_baseline(all_results, args.save)
+    if args.compare:
+        try:
+            worse = compare(all_results, args.compare)
+        except FileNotFoundError:
+            print(f'No baseline at {args.compare}: run with --save to store '
+                  'one, then compare with it')
+            exit(0)
+        for bench, result, before, after in worse:
+            print(f'{bench}.{result}: {before:.3f} -> {after:.3f}')
+        exit(1 if worse else 0)
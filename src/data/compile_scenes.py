@@ -0,0 +1,42 @@
+"""
+Script that compiles scene files into the precompiled format loaded by
+engine.sceneloader (see its docs), so that they don't need to be parsed from
+YAML at runtime. Compiled files are written next to the YAML files.
+
+Usage: python compile_scenes.py [-j JOBS] [SCENE_NAME ...]
+
+Without scene names, every scene in the 'scenes' folder is compiled. Scenes
+are compiled in parallel by JOBS processes (one per CPU by default). Exit with
+code 1 if any scene is not valid.
+"""
+import argparse
+
+import engine
+import main
+
+
+def compile_scenes(names=None, workers=None):
+    """
+    Compile the scenes 'names' (every scene in SCENE_PATH if None) in
+    'workers' processes (see engine.sceneloader.warm_up()) and write their
+    compiled files, even if they are up to date. Return a dictionary that maps
+    the name of each scene that failed to its error.
+    """
+    if names is None:
+        names = engine.sceneloader.scene_names()
+    for name in names:
+        engine.sceneloader.compiled_path(name).unlink(missing_ok=True)
+    return engine.sceneloader.warm_up(names, workers)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile scene files.')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of processes (default: one per CPU)')
+    parser.add_argument('scenes', nargs='*', metavar='SCENE_NAME')
+    args = parser.parse_args()
+    main.init()
+    failed = compile_scenes(args.scenes or None, args.jobs)
+    for scene_name, error in failed.items():
+        print(f'{scene_name}: {error}')
+    exit(1 if failed else 0)
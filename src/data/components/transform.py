@@ -19,8 +19,19 @@ class Transform(Component):
     A Transform should always be attached at GameObject creation (passed in
     to the constructor) and every GameObject should have one. This is why
     a Transform will raise a Warning if detached, unless forced.
+
+    The parent Transform is stored in the 'parent' attribute; to change it at
+    runtime use set_parent() and unparent(). When a scene file is loaded, the
+    parent is linked before the CREATE event (see on_link()), so its position
+    is known and it can be declared after its childs.
     """
 
+    __slots__ = ('parent', 'absolute_pos', 'local_pos', 'childs',
+                 '_parent_name', '_arg_pos', '_absolute')
+
+    scene_links = ('parent',)
+    acyclic_links = ('parent',)
+
     def __init__(self, x=0, y=0, absolute=True, parent=None):
         """
         Constructor for the Transform. Takes in the position of the
@@ -50,12 +61,28 @@ class Transform(Component):
         if self.gameobject.get_component(Transform) is not self:
             raise ComponentError("More than one Transform component on the "
                                  "same GameObject is not allowed", self)
-        if self._parent_name is not None:
-            self.parent(self._parent_name)
-        if self._absolute:
-            self._pos_from_absolute(*self._arg_pos)
-        else:
-            self._pos_from_local(*self._arg_pos)
+        if self._parent_name is not None and self.parent is None:
+            self.set_parent(self._parent_name)
+        self._init_pos()
+
+    def _init_pos(self):
+        """
+        Internal use: init position from arguments, after initing the one of
+        the parents that haven't done it yet (a parent can be created after
+        its childs when a scene is loaded).
+        """
+        chain = []
+        transform = self
+        while transform is not None and transform._arg_pos is not None:
+            chain.append(transform)
+            transform = transform.parent
+        for transform in reversed(chain):
+            x, y = transform._arg_pos
+            transform._arg_pos = None
+            if transform._absolute:
+                transform._pos_from_absolute(x, y)
+            else:
+                transform._pos_from_local(x, y)
 
     def _pos_from_absolute(self, x, y):
         """Gets absolute and local position from absolute x and y"""
@@ -77,6 +104,11 @@ class Transform(Component):
         self.absolute_pos[0] = self.parent.absolute_pos[0] + self.local_pos[0]
         self.absolute_pos[1] = self.parent.absolute_pos[1] + self.local_pos[1]
 
+    def on_link(self, parent=None):
+        """Parent this Transform to the GameObject 'parent', linked at load"""
+        if parent is not None:
+            self._parent_to(parent)
+
     def on_component_update(self):
         """Update positions"""
         if self.parent is None:
@@ -91,10 +123,20 @@ class Transform(Component):
                                  'Transform')
 
     def on_destroy(self):
-        """Unparent this Tranform and destroy all its childs"""
+        """
+        Unparent this Tranform and destroy all its childs. Descendants are
+        destroyed from the deepest one, so that deep hierarchies don't
+        recurse.
+        """
         self.unparent()
 
-        for child in self.childs:
+        descendants = []
+        stack = list(self.childs)
+        while stack:
+            child = stack.pop()
+            descendants.append(child)
+            stack.extend(child.childs)
+        for child in reversed(descendants):
             child.destroy_gameobject()
 
     def destroy_gameobject(self):
@@ -108,19 +150,24 @@ class Transform(Component):
         """Remove this Transforms parent"""
         if not self.parent:
             return
+        self.parent.childs.remove(self)
         self.parent = None
         self.local_pos = [0, 0]
 
-    def parent(self, parent):
+    def set_parent(self, parent):
         """Parent this Transform to a GameObject with name or id 'parent'"""
         parent_gobj = self.gameobject.find(parent)
+        if not parent_gobj:
+            raise ComponentError(f'Gameobject {parent} cannot be found', self)
+        self._parent_to(parent_gobj)
+
+    def _parent_to(self, parent_gobj):
+        """Internal use: parent this Transform to GameObject 'parent_gobj'"""
         if parent_gobj == self.gameobject:
             raise ComponentError('Transform cannot be parent of itself', self)
-        if not parent:
-            raise ComponentError(f'Gameobject {parent} cannot be found', self)
         parent_transform = parent_gobj.get_component(Transform)
         if not parent_transform:
-            raise ComponentError(f'Gameobject {parent} is without a Transform',
-                                 self)
+            raise ComponentError(f'Gameobject {parent_gobj.name} is without a '
+                                 'Transform', self)
         self.parent = parent_transform
         self.parent.childs.append(self)
@@ -6,6 +6,13 @@ Package containing all the logic to make the game work. This includes:
 - scene loading (engine.scene_loader);
 - gameobject system (engine.gameobject)
 - component system (engine.basecomponents)
+- component type names (engine.registry)
+- coroutines (engine.coroutines)
+- timers (engine.timers)
+- asset caches (engine.assets)
+- frame drawing (engine.render)
+- camera and culling (engine.camera)
+- frame profiling (engine.profiler)
 
 For more in depth documentation, read the docs for each of the
 module/subpackage.
@@ -17,7 +24,13 @@ typing their module. For example, to use the GameObject class you can write
 
 # Modules
 import engine.vars
+import engine.registry
 import engine.sceneloader
+import engine.assets
+import engine.render
+import engine.camera
+import engine.profiler
+import engine.timers
 
 # Subpackages
 import engine.eventsys
@@ -29,9 +42,10 @@ from engine.basecomponents import Component
 from engine.basecomponents import Behaviour
 from engine.gameobject import GameObject
 from engine.scene import Scene
+from engine.camera import Camera
+from engine.coroutines import wait_seconds
+from engine.coroutines import wait_frames
+from engine.coroutines import wait_event
 
-# Greet user pygame style
 VERSION = "0.1"
 URL = 'https://github.com/BreadyX/S2DE'
-print(f"Welcome and thank you for using S2DE v{VERSION}.""\n"
-      f"Check out the GitHub repo: {URL}")
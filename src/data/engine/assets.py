@@ -0,0 +1,288 @@
+"""
+Module containing the engine-wide caches for the assets used by the
+renderers.
+
+Fonts are cached in the FontCache: every (font, size) pair is loaded only once
+and then shared. The pygame font module is initialized only when the first
+Font is loaded.
+
+Rendered text is cached in the TextCache, an OrderedDict ordered from the
+least (first in dict) to the most (last in dict) recently used Surface. The
+cache is bound by the memory of the Surfaces it holds ('max_bytes').
+
+Images are cached in the ImageCache and texture atlases (many sprites in one
+image, see the Atlas class) in the AtlasCache. Both are reference counted:
+acquire() loads the asset only if it isn't loaded yet and every acquire()
+has to be matched by a release(). When nobody uses an asset anymore, it is
+kept in a small list of unused assets ('unused_size' long), so that changing
+Scene doesn't load again the assets the two Scenes share. Images are
+converted to the pixel format of the display, if there is one. Paths are
+relative to the GAME_PATH.
+
+Surfaces rasterized by renderers are shared through the SurfacePool, keyed by
+everything that defines how they look: identical renderers use the same
+Surface, so the memory used depends on the number of distinct looks, not on
+the number of renderers. The pool is reference counted too, but a Surface is
+freed as soon as nobody uses it.
+
+Cached Surfaces are shared: they must be treated as read-only.
+"""
+from collections import OrderedDict
+import pygame
+
+import engine.vars as gvars
+
+
+class FontCache:
+    """Static class that handles the font cache"""
+
+    cache = {}
+
+    @classmethod
+    def get(cls, font, size):
+        """
+        Return the Font 'font' (a path to a font file, None for the default
+        one) with size 'size', loading it only if it isn't cached yet.
+        """
+        key = (font, size)
+        try:
+            return cls.cache[key]
+        except KeyError:
+            pass
+        if not pygame.font.get_init():
+            pygame.font.init()
+        loaded = pygame.font.Font(font, size)
+        cls.cache[key] = loaded
+        return loaded
+
+    @classmethod
+    def clear(cls):
+        """Remove every Font from the cache"""
+        cls.cache.clear()
+
+
+class TextCache:
+    """Static class that handles the rendered text cache"""
+
+    cache = OrderedDict()
+    max_bytes = 8 * 1024 * 1024
+    used_bytes = 0
+
+    @classmethod
+    def render(cls, text, size, color, antialias=True, font=None):
+        """
+        Return a Surface with 'text' rendered with the Font 'font' of size
+        'size' and color 'color'. The Surface is rendered only if it isn't
+        cached yet.
+        """
+        key = (text, size, tuple(color), antialias, font)
+        try:
+            surface = cls.cache[key]
+        except KeyError:
+            pass
+        else:
+            cls.cache.move_to_end(key)
+            return surface
+        surface = FontCache.get(font, size).render(text, antialias, color)
+        cls.add(key, surface)
+        return surface
+
+    @classmethod
+    def add(cls, key, surface):
+        """Add 'surface' with key 'key' to the cache and trim it"""
+        cls.cache[key] = surface
+        cls.used_bytes += cls.surface_bytes(surface)
+        cls.trim_cache()
+
+    @classmethod
+    def trim_cache(cls):
+        """
+        Remove every item from older to newer until the cache holds no more
+        than 'max_bytes'. The newest Surface is always kept.
+        """
+        while cls.used_bytes > cls.max_bytes and len(cls.cache) > 1:
+            _, surface = cls.cache.popitem(last=False)
+            cls.used_bytes -= cls.surface_bytes(surface)
+
+    @classmethod
+    def clear(cls):
+        """Remove every Surface from the cache"""
+        cls.cache.clear()
+        cls.used_bytes = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        """Return the size in bytes of the pixels of 'surface'"""
+        return surface.get_pitch() * surface.get_height()
+
+
+class _SharedCache:
+    """
+    Base of the reference counted caches. Children have to define their own
+    'cache', 'counts' and 'unused' and override load().
+    """
+
+    cache = None
+    counts = None
+    unused = None
+    unused_size = 16
+
+    @classmethod
+    def acquire(cls, key, load=None):
+        """
+        Return the asset 'key', loading it if it isn't loaded yet. If 'load' is
+        passed, it is the function called to load the asset instead of load().
+        """
+        try:
+            asset = cls.cache[key]
+        except KeyError:
+            asset = cls.unused.pop(key, None)
+            if asset is None:
+                asset = cls.load(key) if load is None else load()
+            cls.cache[key] = asset
+            cls.counts[key] = 0
+        cls.counts[key] += 1
+        return asset
+
+    @classmethod
+    def release(cls, key):
+        """
+        Stop using the asset 'key'. When nobody uses it anymore, the asset is
+        moved in the unused assets.
+        """
+        cls.counts[key] -= 1
+        if cls.counts[key] > 0:
+            return
+        del cls.counts[key]
+        cls.unused[key] = cls.cache.pop(key)
+        while len(cls.unused) > cls.unused_size:
+            cls.unload(*cls.unused.popitem(last=False))
+
+    @classmethod
+    def load(cls, key):
+        """Return the asset 'key' loaded from disk"""
+        raise NotImplementedError
+
+    @classmethod
+    def unload(cls, key, asset):
+        """Executed when the asset 'key' is thrown away"""
+        pass
+
+
+class ImageCache(_SharedCache):
+    """Static class that handles the image cache, keyed by path"""
+
+    cache = {}
+    counts = {}
+    unused = OrderedDict()
+
+    @classmethod
+    def load(cls, key):
+        """Load the image at path 'key' and convert it to the display format"""
+        image = pygame.image.load(str(gvars.GAME_PATH.joinpath(key)))
+        if pygame.display.get_surface() is None:
+            return image
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+
+class Atlas:
+    """
+    An Atlas (or sprite sheet) is a single image containing many sprites, its
+    frames. Each frame has a key (a name or an index) and a Rect of the image.
+
+    Frames are returned as subsurfaces: they share the pixels of the image, so
+    every sprite drawn from the Atlas uses the same memory. The subsurface of
+    each frame is created once and then shared.
+
+    An Atlas can be described by a YAML file containing the path of the image
+    ('image') and a dictionary that maps each frame name to its Rect as
+    [x, y, width, height] ('frames'). A sprite sheet made of frames with the
+    same size doesn't need one: the frames are indexed left to right, top to
+    bottom.
+    """
+
+    __slots__ = ('image_path', 'surface', 'rects', '_frames')
+
+    def __init__(self, image_path, surface, rects):
+        """
+        Constructor for Atlas. Takes in the path of the image ('image_path'),
+        its Surface ('surface') and a dictionary that maps each frame key to
+        its Rect ('rects').
+        """
+        self.image_path = image_path
+        self.surface = surface
+        self.rects = rects
+        self._frames = {}
+
+    def frame(self, key):
+        """Return the Surface of the frame with key 'key'"""
+        try:
+            return self._frames[key]
+        except KeyError:
+            pass
+        try:
+            frame = self.surface.subsurface(self.rects[key])
+        except KeyError:
+            raise KeyError(f'Frame {key} is not in atlas {self.image_path}')
+        self._frames[key] = frame
+        return frame
+
+    @classmethod
+    def from_grid(cls, image_path, surface, frame_size):
+        """
+        Return the Atlas of a sprite sheet, whose frames are all of size
+        'frame_size'
+        """
+        width, height = frame_size
+        columns = surface.get_width() // width
+        rows = surface.get_height() // height
+        rects = {i: pygame.Rect((i % columns) * width, (i // columns) * height,
+                                width, height)
+                 for i in range(columns * rows)}
+        return cls(image_path, surface, rects)
+
+
+class AtlasCache(_SharedCache):
+    """
+    Static class that handles the atlas cache. The key is either the path of
+    the YAML file describing the Atlas or a tuple with the path of a sprite
+    sheet image and the size of its frames.
+    """
+
+    cache = {}
+    counts = {}
+    unused = OrderedDict()
+
+    @classmethod
+    def load(cls, key):
+        """Load the Atlas 'key', acquiring its image from the ImageCache"""
+        import ruamel.yaml
+        if isinstance(key, tuple):
+            path, frame_size = key
+            return Atlas.from_grid(path, ImageCache.acquire(path), frame_size)
+        data = ruamel.yaml.YAML(typ='safe').load(gvars.GAME_PATH.joinpath(key))
+        path = data['image']
+        rects = {name: pygame.Rect(rect)
+                 for name, rect in data['frames'].items()}
+        return Atlas(path, ImageCache.acquire(path), rects)
+
+    @classmethod
+    def unload(cls, key, asset):
+        """Release the image of the Atlas"""
+        ImageCache.release(asset.image_path)
+
+
+class SurfacePool(_SharedCache):
+    """
+    Static class that handles the pool of rasterized Surfaces. There is no
+    load(): every acquire() passes the function that rasterizes the Surface,
+    called only if the Surface isn't in the pool yet. The key has to contain
+    every parameter that changes the pixels of the Surface.
+    """
+
+    cache = {}
+    counts = {}
+    unused = OrderedDict()
+    unused_size = 0
@@ -3,6 +3,7 @@ Module containing base classes that every Component inherits from. For info
 on how a Component or Behaviour works, check out the docs for the respective
 classes.
 """
+import engine.vars as gvars
 
 
 class Component:
@@ -33,10 +34,20 @@ class Component:
     - on_spawn(): executed everytime a GameObject gets spawned.
     - on_attach(): executed right after the Component is attached. Should be
       used as a initialization method.
+    - on_link(**links): executed when a scene file is loaded, after every
+      GameObject of the Scene is constructed and before any on_create(). It
+      takes in, for every argument listed in 'scene_links', the GameObject
+      named by that argument.
     - on_component_update(): executed everytime a GameObject updates. Since this
       is a function that will run every frame, it is best to put code that
       relies on heavy methods such as find() or get_component() in the
       on_attach() and on_create() method.
+    - on_fixed_update(): executed at a fixed rate, independent from the frame
+      rate, in the 'fixed' loop mode (see main module docs). The time between
+      two fixed updates is always engine.vars.FIXED_DELTA_TIME, so it is where
+      the simulation (movement, physics) goes, while on_component_update()
+      draws its results. Only Components that override it are subscribed to
+      the event.
     - on_detach(forced): executed right before a Component gets detached.
       The on_detach() method can be 'forced', signalling to the Component that
       it is best not to throw a fuss when detached (like the provided Transform
@@ -57,8 +68,33 @@ class Component:
 
     The base Component class should not be used: every Component has to inherit
     from it.
+
+    Component and Behaviour declare '__slots__', so they don't carry a
+    per-instance '__dict__'. A subclass that doesn't declare '__slots__' gets
+    a '__dict__' back and works exactly as before. To opt in to the compact
+    representation, a Component has to list its own attributes in a
+    '__slots__' tuple (only the new ones, not the inherited ones):
+
+        class Health(Component):
+            __slots__ = ('hp', 'max_hp')
+
+    Every class in the hierarchy must declare '__slots__' for the instances to
+    be dict-less: a single class without it brings the '__dict__' back.
+
+    A Component that takes as constructor argument the name of another
+    GameObject of the Scene (like the 'parent' of the Transform) lists those
+    arguments in 'scene_links'. When a scene file is loaded, those names are
+    checked against the GameObjects of the Scene and the GameObjects are
+    passed to on_link(), so the Component doesn't have to find() them. The
+    links listed in 'acyclic_links' too form a hierarchy: a GameObject that
+    links, through other GameObjects, to itself is an error.
     """
 
+    __slots__ = ('gameobject',)
+
+    scene_links = ()
+    acyclic_links = ()
+
     def __init__(self):
         """Base Component constructor"""
         self.gameobject = None
@@ -81,6 +117,13 @@ class Component:
         """
         pass
 
+    def on_link(self, **links):
+        """
+        Executed when a scene file is loaded, before on_create(). Takes in
+        the linked GameObject of each argument listed in 'scene_links'.
+        """
+        pass
+
     def on_component_update(self):
         """
         Executed everytime a GameObject updates. Since this is a function that
@@ -90,6 +133,25 @@ class Component:
         """
         pass
 
+    def on_fixed_update(self):
+        """
+        Executed at a fixed rate in the 'fixed' loop mode, only if overridden.
+        """
+        pass
+
+    @classmethod
+    def has_fixed_update(cls):
+        """Return True if the Component uses on_fixed_update()"""
+        return cls.on_fixed_update is not Component.on_fixed_update
+
+    @classmethod
+    def update_interval(cls):
+        """
+        Return every how many frames the Component updates: always 1, only
+        Behaviours can be throttled
+        """
+        return 1
+
     def on_detach(self, forced=False):
         """
         Executed right before a Component gets detached. The on_detach() method
@@ -128,8 +190,33 @@ class Behaviour(Component):
     normal Component as the method will be called at every update, not obeying
     the enabled flag. Overriding the wrong update method might also risk of
     breaking the correct one.
+
+    In the same way, a Behaviour that needs fixed updates overrides
+    on_behaviour_fixed_update(), which is executed only if it is enabled.
+
+    A Behaviour that doesn't need to update every frame (AI decisions, slow
+    checks) declares how often it updates: either every 'update_frames'
+    frames or 'update_rate' times per second (converted to frames with the
+    FRAME_RATE when attached). The Scene spreads the throttled Behaviours with
+    the same interval evenly across the frames of the interval (see
+    engine.scene.Scene), so they don't all update in the same frame. While a
+    throttled Behaviour updates, DELTA_TIME is the time passed since its last
+    update.
+
+        class Brain(Behaviour):
+            update_rate = 5
+
+    A Behaviour that has to wait (for some time, some frames or an event)
+    doesn't need to count in every update: it can start a coroutine with
+    start_coroutine() instead (see engine.coroutines). Coroutines run even if
+    the Behaviour is disabled and are stopped when it is detached.
     """
 
+    __slots__ = ('enabled',)
+
+    update_frames = 1
+    update_rate = None
+
     def __init__(self, enabled=True):
         """Base Behaviour constructor"""
         super().__init__()
@@ -145,6 +232,50 @@ class Behaviour(Component):
         """Executed at every GameObject update if the Behaviour is enabled."""
         pass
 
+    def on_fixed_update(self):
+        """Inherited fixed update method. Should not be touched."""
+        if not self.enabled:
+            return
+        self.on_behaviour_fixed_update()
+
+    def on_behaviour_fixed_update(self):
+        """
+        Executed at every GameObject fixed update if the Behaviour is enabled,
+        only if overridden.
+        """
+        pass
+
+    def start_coroutine(self, generator):
+        """
+        Start the coroutine 'generator' in the Scene of the GameObject and
+        return its Coroutine. Raise ComponentError if not attached.
+        """
+        if self.gameobject is None:
+            raise ComponentError('Cannot start a coroutine of a detached '
+                                 'Behaviour', self)
+        return self.gameobject.scene.scheduler.start(generator, self)
+
+    def stop_coroutines(self):
+        """Stop every coroutine started by the Behaviour"""
+        if self.gameobject is not None:
+            self.gameobject.scene.scheduler.stop_all(self)
+
+    @classmethod
+    def has_fixed_update(cls):
+        """Return True if the Behaviour uses on_behaviour_fixed_update()"""
+        return (cls.on_behaviour_fixed_update
+                is not Behaviour.on_behaviour_fixed_update)
+
+    @classmethod
+    def update_interval(cls):
+        """
+        Return every how many frames the Behaviour updates, from
+        'update_rate' if set, else from 'update_frames'
+        """
+        if cls.update_rate:
+            return max(1, round(gvars.FRAME_RATE / cls.update_rate))
+        return max(1, cls.update_frames)
+
     def __str__(self):
         """Return a formatted string with all the Behaviour's defining info."""
         return f'Behaviour(type={self.__class__}, enabled={self.enabled}, ' \
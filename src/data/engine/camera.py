@@ -0,0 +1,219 @@
+"""
+Useful docs to read for more information:
+ - engine.render module
+
+Module containing the Camera and the spatial index used to cull what is out
+of its view.
+
+Transforms positions are in world space: the Camera decides which part of the
+world is shown ('position' and 'zoom') and where on the screen ('viewport').
+The active Camera is engine.vars.CAMERA; it is used by engine.render to draw
+every frame and by the renderers to skip everything that is out of view.
+
+Renderers keep their bounds (in world space) in 'index', a SpatialHash. To
+know what is in view, the Camera asks the index only for the cells that the
+view covers, so objects far away cost nothing to discard.
+"""
+import math
+import pygame
+
+import engine.vars as gvars
+
+
+class SpatialHash:
+    """
+    A SpatialHash divides the world in square cells of side 'cell_size' and
+    remembers which keys have bounds that overlap each cell. It is used to
+    find every key near a region without looking at all of them.
+    """
+
+    __slots__ = ('cell_size', 'cells', 'entries')
+
+    def __init__(self, cell_size=256):
+        """
+        Constructor for SpatialHash. Takes in the side of the cells in pixels
+        ('cell_size').
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entries = {}
+
+    def update(self, key, rect):
+        """Insert 'key' with bounds 'rect' or move it there if already in"""
+        rect = pygame.Rect(rect)
+        cells = self._cells_of(rect)
+        old = self.entries.get(key)
+        if old is not None and old[1] != cells:
+            self._unlink(key, old[1])
+            old = None
+        if old is None:
+            for cell in cells:
+                self.cells.setdefault(cell, set()).add(key)
+        self.entries[key] = (rect, cells)
+
+    def remove(self, key):
+        """Remove 'key' from the index, if present"""
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self._unlink(key, old[1])
+
+    def query(self, rect):
+        """Return the set of keys with bounds that collide with 'rect'"""
+        rect = pygame.Rect(rect)
+        found = set()
+        entries = self.entries
+        for cell in self._cells_of(rect):
+            for key in self.cells.get(cell, ()):
+                if key not in found and rect.colliderect(entries[key][0]):
+                    found.add(key)
+        return found
+
+    def clear(self):
+        """Remove every key from the index"""
+        self.cells.clear()
+        self.entries.clear()
+
+    def _cells_of(self, rect):
+        """Internal use: return the tuple of cells covered by 'rect'"""
+        size = self.cell_size
+        x_start, y_start = rect.left // size, rect.top // size
+        x_end = (rect.right - 1) // size if rect.width else x_start
+        y_end = (rect.bottom - 1) // size if rect.height else y_start
+        return tuple((x, y) for x in range(x_start, x_end + 1)
+                     for y in range(y_start, y_end + 1))
+
+    def _unlink(self, key, cells):
+        """Internal use: remove 'key' from 'cells'"""
+        for cell in cells:
+            keys = self.cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self.cells[cell]
+
+
+index = SpatialHash()
+
+
+class Camera:
+    """
+    A Camera shows the part of the world with the top left corner at
+    'position' (in world space), magnified by 'zoom', inside the 'viewport'
+    Rect of the screen.
+
+    The set of keys of the index that are in view ('visible') is computed the
+    first time it is needed in a frame and whenever the Camera changes.
+    """
+
+    __slots__ = ('_position', '_zoom', '_viewport', '_visible', '_scaled')
+
+    def __init__(self, position=(0, 0), zoom=1, viewport=None):
+        """
+        Constructor for Camera. Takes in the world position of the top left
+        corner of the view ('position'), the magnification ('zoom') and the
+        Rect of the screen in which the view is drawn ('viewport'). If no
+        'viewport' is passed, the whole SCREEN is used.
+        """
+        if viewport is None:
+            viewport = gvars.SCREEN.get_rect()
+        self._position = tuple(position)
+        self._zoom = zoom
+        self._viewport = pygame.Rect(viewport)
+        self._visible = None
+        self._scaled = {}
+
+    @property
+    def position(self):
+        """World position of the top left corner of the view"""
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = tuple(value)
+        self._visible = None
+
+    @property
+    def zoom(self):
+        """Magnification of the view: 2 shows everything twice as big"""
+        return self._zoom
+
+    @zoom.setter
+    def zoom(self, value):
+        self._zoom = value
+        self._visible = None
+        self._scaled = {}
+
+    @property
+    def viewport(self):
+        """Rect of the screen in which the view is drawn"""
+        return self._viewport
+
+    @viewport.setter
+    def viewport(self, value):
+        self._viewport = pygame.Rect(value)
+        self._visible = None
+
+    @property
+    def view_rect(self):
+        """Rect of the world that is in view"""
+        return pygame.Rect(self._position,
+                           (math.ceil(self._viewport.width / self._zoom),
+                            math.ceil(self._viewport.height / self._zoom)))
+
+    @property
+    def visible(self):
+        """Set of keys of the index whose bounds are in view"""
+        if self._visible is None:
+            self._visible = index.query(self.view_rect)
+        return self._visible
+
+    def move(self, x, y):
+        """Move the view by 'x' and 'y' world units"""
+        self.position = (self._position[0] + x, self._position[1] + y)
+
+    def sees(self, rect):
+        """Return True if the world Rect 'rect' is in view"""
+        return self.view_rect.colliderect(rect)
+
+    def refresh(self):
+        """
+        Forget what is in view, so that it will be computed again. Called by
+        engine.render at the end of every frame.
+        """
+        self._visible = None
+
+    def to_screen(self, pos):
+        """Convert the world position 'pos' to a screen position"""
+        return (self._viewport.x + (pos[0] - self._position[0]) * self._zoom,
+                self._viewport.y + (pos[1] - self._position[1]) * self._zoom)
+
+    def to_world(self, pos):
+        """Convert the screen position 'pos' to a world position"""
+        return (self._position[0] + (pos[0] - self._viewport.x) / self._zoom,
+                self._position[1] + (pos[1] - self._viewport.y) / self._zoom)
+
+    def project(self, items):
+        """
+        Convert the render queue 'items' of (layer, Surface, world position)
+        into a list of (Surface, screen Rect, layer). If the zoom is not 1,
+        Surfaces are scaled (scaled Surfaces are kept while they are used).
+        """
+        if self._zoom == 1:
+            x, y = self.to_screen((0, 0))
+            return [(surface, surface.get_rect(topleft=(pos[0] + x,
+                                                        pos[1] + y)), layer)
+                    for layer, surface, pos in items]
+        scaled = {}
+        commands = []
+        for layer, surface, pos in items:
+            big = scaled.get(surface)
+            if big is None:
+                big = self._scaled.get(surface)
+            if big is None:
+                size = (round(surface.get_width() * self._zoom),
+                        round(surface.get_height() * self._zoom))
+                big = pygame.transform.scale(surface, size)
+            scaled[surface] = big
+            commands.append((big, big.get_rect(topleft=self.to_screen(pos)),
+                             layer))
+        self._scaled = scaled
+        return commands
@@ -0,0 +1,311 @@
+"""
+Useful docs to read for more information:
+ - engine.basecomponents.Behaviour class
+ - engine.eventsys package
+
+Module containing the coroutine scheduler of the Scenes.
+
+A coroutine is a generator started by a Behaviour (see
+Behaviour.start_coroutine()). It runs until its first 'yield' right away, then
+every value it yields tells the scheduler when to resume it:
+- wait_seconds(seconds): after 'seconds' seconds of game time;
+- wait_frames(frames): after 'frames' frames ('yield None' is the same as
+  'yield wait_frames(1)');
+- wait_event(type_id, listener_cls, gobj_id): after the event 'type_id' of
+  'listener_cls' (a GameEvent by default) is launched. The EventData of the
+  event is the value of the 'yield' expression.
+A coroutine can wait for another generator with 'yield from'.
+
+    def blink(self):
+        while True:
+            self.enabled = not self.enabled
+            yield wait_seconds(0.5)
+
+Every Scene has its own Scheduler, advanced once per Scene update: when a
+Scene is suspended its coroutines are paused too and they are stopped when the
+Scene is destroyed. Coroutines that wait for a time or a number of frames are
+kept in two heaps ordered by when they are due, so only the due ones are
+resumed: a waiting coroutine costs nothing per frame. Coroutines that wait for
+an event are resumed at the first Scheduler advance after the event. A
+stopped coroutine is only marked and is thrown away when it becomes due; when
+stopped coroutines are more than half of the heaps, they are rebuilt without
+them.
+
+The coroutines of a Component are stopped when it is detached.
+"""
+import heapq
+import itertools
+
+import engine.eventsys as ev
+import engine.vars as gvars
+
+
+class WaitSeconds:
+    """Instruction yielded by a coroutine to wait 'seconds' seconds"""
+
+    __slots__ = ('seconds',)
+
+    def __init__(self, seconds):
+        """Constructor for WaitSeconds. Takes in the seconds to wait"""
+        self.seconds = seconds
+
+    def schedule(self, scheduler, coroutine):
+        """Schedule 'coroutine' in 'scheduler'"""
+        scheduler._push(scheduler.timed, scheduler.time + self.seconds,
+                        coroutine)
+
+
+class WaitFrames:
+    """Instruction yielded by a coroutine to wait 'frames' frames"""
+
+    __slots__ = ('frames',)
+
+    def __init__(self, frames):
+        """Constructor for WaitFrames. Takes in the frames to wait"""
+        self.frames = frames
+
+    def schedule(self, scheduler, coroutine):
+        """Schedule 'coroutine' in 'scheduler'"""
+        scheduler._push(scheduler.framed, scheduler.frame + self.frames,
+                        coroutine)
+
+
+class WaitEvent:
+    """
+    Instruction yielded by a coroutine to wait for the event with id
+    'type_id' of the Listener class 'listener_cls'. GameObjectEvents need the
+    id of the GameObject that launches them ('gobj_id').
+    """
+
+    __slots__ = ('type_id', 'listener_cls', 'gobj_id')
+
+    def __init__(self, type_id, listener_cls, gobj_id=None):
+        """
+        Constructor for WaitEvent. Takes in the id of the event, the Listener
+        class and the GameObject id, for GameObjectEvents.
+        """
+        self.type_id = type_id
+        self.listener_cls = listener_cls
+        self.gobj_id = gobj_id
+
+    def schedule(self, scheduler, coroutine):
+        """Schedule 'coroutine' in 'scheduler'"""
+        handler = ev.EventHandler(coroutine.wake)
+        if self.listener_cls is ev.GameObjectEventListener:
+            listener = self.listener_cls(handler, self.type_id, self.gobj_id)
+        else:
+            listener = self.listener_cls(handler, self.type_id)
+        coroutine.listener = listener
+        listener.listen()
+
+
+def wait_seconds(seconds):
+    """Return the instruction to wait 'seconds' seconds of game time"""
+    return WaitSeconds(seconds)
+
+
+def wait_frames(frames):
+    """Return the instruction to wait 'frames' frames"""
+    return WaitFrames(frames)
+
+
+def wait_event(type_id, listener_cls=ev.GameEventListener, gobj_id=None):
+    """
+    Return the instruction to wait for the event with id 'type_id' of the
+    Listener class 'listener_cls' (of the GameObject with id 'gobj_id' for
+    GameObjectEvents).
+    """
+    return WaitEvent(type_id, listener_cls, gobj_id)
+
+
+class Coroutine:
+    """
+    A running coroutine: its generator, the Component that started it
+    ('owner'), its Scheduler and whether it is finished or stopped ('done').
+    """
+
+    __slots__ = ('generator', 'owner', 'scheduler', 'done', 'listener',
+                 '_value', '_queued')
+
+    def __init__(self, generator, owner, scheduler):
+        """
+        Constructor for Coroutine. Takes in the generator, the Component that
+        started it and the Scheduler that runs it.
+        """
+        self.generator = generator
+        self.owner = owner
+        self.scheduler = scheduler
+        self.done = False
+        self.listener = None
+        self._value = None
+        self._queued = False
+
+    @property
+    def scene(self):
+        """
+        The Scene of the coroutine, so the Listener of a wait_event() belongs
+        to it (see engine.eventsys.source.launch_scene())
+        """
+        return self.scheduler.scene
+
+    def stop(self):
+        """
+        Stop the coroutine: it will never be resumed again. A coroutine can
+        stop itself too (for example by destroying its GameObject): it is
+        stopped at its next 'yield'.
+        """
+        if self.done:
+            return
+        self.scheduler._finish(self)
+        self._ignore()
+        try:
+            self.generator.close()
+        except ValueError:  # Stopping itself, still running
+            pass
+
+    def wake(self, event_data=None):
+        """
+        Resume the coroutine, waiting for an event, at the next advance() of
+        its Scheduler, passing it 'event_data'
+        """
+        self._ignore()
+        self._value = event_data
+        self.scheduler.ready.append(self)
+
+    def _ignore(self):
+        """Internal use: stop waiting for an event, if waiting"""
+        if self.listener is not None:
+            self.listener.ignore()
+            self.listener = None
+
+
+class Scheduler:
+    """
+    Scheduler of the coroutines of the Scene 'scene'. It keeps its own game
+    time ('time', in seconds) and frame count ('frame'), advanced by
+    advance().
+    """
+
+    __slots__ = ('scene', 'time', 'frame', 'timed', 'framed', 'ready',
+                 'order', 'owners', '_stopped')
+
+    def __init__(self, scene=None):
+        """Constructor for Scheduler. Takes in the Scene it belongs to"""
+        self.scene = scene
+        self.time = 0
+        self.frame = 0
+        self.timed = []
+        self.framed = []
+        self.ready = []
+        self.order = itertools.count()
+        self.owners = {}
+        self._stopped = 0
+
+    def start(self, generator, owner=None):
+        """
+        Start the coroutine 'generator' of the Component 'owner': run it until
+        its first 'yield' and return its Coroutine.
+        """
+        coroutine = Coroutine(generator, owner, self)
+        self.owners.setdefault(id(owner), set()).add(coroutine)
+        self._resume(coroutine)
+        return coroutine
+
+    def stop_all(self, owner):
+        """Stop every coroutine of the Component 'owner'"""
+        for coroutine in list(self.owners.get(id(owner), ())):
+            coroutine.stop()
+
+    def advance(self, delta_time=None):
+        """
+        Advance the Scheduler by a frame of 'delta_time' seconds (DELTA_TIME
+        if None) and resume the coroutines that are due. Coroutines scheduled
+        while advancing are resumed at the next advance at the earliest.
+        """
+        if delta_time is None:
+            delta_time = gvars.DELTA_TIME
+        self.time += delta_time
+        ready, self.ready = self.ready, []
+        for coroutine in ready:
+            self._resume(coroutine)
+        for queue, now in ((self.timed, self.time),
+                           (self.framed, self.frame)):
+            due = []
+            while queue and queue[0][0] <= now:
+                coroutine = heapq.heappop(queue)[2]
+                coroutine._queued = False
+                if coroutine.done:
+                    self._stopped -= 1
+                else:
+                    due.append(coroutine)
+            for coroutine in due:
+                self._resume(coroutine)
+        self.frame += 1
+
+    def clear(self):
+        """Stop every coroutine"""
+        for coroutines in list(self.owners.values()):
+            for coroutine in list(coroutines):
+                coroutine.stop()
+        self.timed.clear()
+        self.framed.clear()
+        self.ready.clear()
+        self._stopped = 0
+
+    def pending(self):
+        """Return the number of coroutines not finished yet"""
+        return sum(len(coroutines) for coroutines in self.owners.values())
+
+    def _resume(self, coroutine):
+        """
+        Internal use: run 'coroutine' until its next 'yield' and schedule it
+        again, or forget it if it has finished.
+        """
+        if coroutine.done:
+            return
+        value, coroutine._value = coroutine._value, None
+        try:
+            instruction = coroutine.generator.send(value)
+        except StopIteration:
+            self._finish(coroutine)
+            return
+        except BaseException:
+            self._finish(coroutine)
+            raise
+        if coroutine.done:
+            return
+        if instruction is None:
+            instruction = WaitFrames(1)
+        instruction.schedule(self, coroutine)
+
+    def _push(self, queue, due, coroutine):
+        """Internal use: add 'coroutine' to the heap 'queue', due at 'due'"""
+        heapq.heappush(queue, (due, next(self.order), coroutine))
+        coroutine._queued = True
+
+    def _finish(self, coroutine):
+        """
+        Internal use: forget the finished or stopped 'coroutine' and its
+        owner. If it is still in a heap, count it and rebuild the heaps when
+        too many are stopped.
+        """
+        coroutine.done = True
+        coroutines = self.owners.get(id(coroutine.owner))
+        if coroutines is not None:
+            coroutines.discard(coroutine)
+            if not coroutines:
+                del self.owners[id(coroutine.owner)]
+        coroutine.owner = None
+        if coroutine._queued:
+            self._stopped += 1
+            if self._stopped > (len(self.timed) + len(self.framed)) // 2:
+                self._compact()
+
+    def _compact(self):
+        """Internal use: rebuild the heaps without the stopped coroutines"""
+        for queue in (self.timed, self.framed):
+            for _, _, coroutine in queue:
+                coroutine._queued = not coroutine.done
+            queue[:] = [item for item in queue if not item[2].done]
+            heapq.heapify(queue)
+        self._stopped = 0
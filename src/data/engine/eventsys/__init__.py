@@ -5,11 +5,17 @@ There are many types of events:
 - GameEvents: Events launched by the main game loop that were in turn launched
   by pygame. One example of such an event is MOUSEMOTION or QUIT;
 - SceneEvents: Events launched by the scene class when a scene, for example, is
-  created (CREATE) or updated (UPDATE).
+  created (CREATE) or updated (UPDATE). Every Scene launches them only to the
+  Listeners of its own GameObjects and Components (and to the Listeners that
+  don't belong to any Scene, if it is the current active Scene): see
+  source.launch_scene().
 - GameObjectEvents: Events launched by GameObjects. This events are tied to the
   id of the GameObject that launches them. This means that only certain
   listeners will get the event. For more details consult the gameobject
   module docs.
+- TimerEvents: Events launched by the timers of the engine.timers module when
+  they expire. Like GameObjectEvents, they are tied to the id of the timer
+  that launches them.
 Many Listeners listen to one event of a certain type and get notified by the
 event source when the event is launched. Every listener contains a EventHandler,
 a callback to the function that it needs to execute.
@@ -18,6 +24,7 @@ There are many types of Listeners, one for each event type:
 - GameEventListener: listens to GameEvents;
 - SceneEventListener: listens to SceneEvents;
 - GameObjectEventListener: listens to GameObjectEvents;
+- TimerEventListener: listens to TimerEvents;
 Each event has a specific id referred to as 'type_id' in code. Each id can be
 found inside the Listener corresponding to that event type, for example the id
 for the scene CREATE event is found inside 'SceneEventListener.CREATE'.
@@ -33,6 +40,7 @@ from engine.eventsys.listeners import Listener
 from engine.eventsys.listeners import GameEventListener
 from engine.eventsys.listeners import SceneEventListener
 from engine.eventsys.listeners import GameObjectEventListener
+from engine.eventsys.listeners import TimerEventListener
 
 # Import subpackages
 import engine.eventsys.listeners
@@ -20,6 +20,8 @@ class EventHandler:
     object are equal.
     """
 
+    __slots__ = ('_callback', '_args', '_kwargs')
+
     def __init__(self, callback, *args, **kwargs):
         """
         Constructor for EventHandler. It takes a function 'callback' and the
@@ -42,6 +44,14 @@ class EventHandler:
         else:
             self._callback(event_data, *self._args, **self._kwargs)
 
+    @property
+    def owner(self):
+        """
+        The object whose method is the callback, None if the callback is not
+        a bound method.
+        """
+        return getattr(self._callback, '__self__', None)
+
     def __eq__(self, other):
         """
         Return true if callback and passed parameters are the same.
@@ -20,8 +20,13 @@ class Listener:
     registered in the aforementioned dictionary and will be visible to the
     sources. When the same Listener will stop listening, it will be removed from
     the list.
+
+    Listeners declare '__slots__' because there are many of them (five for
+    every attached Component): subclasses should do the same.
     """
 
+    __slots__ = ('event_handler', 'type_id', 'forced')
+
     listeners = {}
 
     def __init__(self, event_handler, type_id, force=False):
@@ -101,6 +106,8 @@ class Listener:
 class GameEventListener(Listener):
     """Listener that listens to GameEvents."""
 
+    __slots__ = ()
+
     CLICKDOWN = 0
     CLICKUP = 1
     MOUSEMOTION = 2
@@ -123,15 +130,25 @@ class GameEventListener(Listener):
 class SceneEventListener(Listener):
     """Listener that listens to SceneEvents."""
 
+    __slots__ = ()
+
     # CREATE = 0  Removed because was unreachable
     ACTIVATE = 1
     UPDATE = 2
     DESTROY = 3
+    LOADED = 4
+    SUSPEND = 5
+    RESUME = 6
+    FIXED_UPDATE = 7
 
     listeners = {  # CREATE: [],
         ACTIVATE: set(),
         UPDATE: set(),
-        DESTROY: set()}
+        DESTROY: set(),
+        LOADED: set(),
+        SUSPEND: set(),
+        RESUME: set(),
+        FIXED_UPDATE: set()}
 
 
 class GameObjectEventListener(Listener):
@@ -142,26 +159,81 @@ class GameObjectEventListener(Listener):
     GameObjectEvent, needs the GameObject ID of the GameObject that is tied to.
     This makes each GameObjectEvent visible only to listeners that have the same
     GameObject id as the source, not sharing said event with all listeners.
+
+    Besides the 'listeners' dictionary, listening GameObjectEventListeners are
+    indexed by event and GameObject ID in the 'by_gobj' dictionary, so that
+    launching a GameObjectEvent or creating a Listener doesn't go through the
+    Listeners of every other GameObject.
     """
 
+    __slots__ = ('gobj_id',)
+
     CREATE = 0
     SPAWN = 1
     UPDATE = 3
     DESPAWN = 5
     DESTROY = 6
+    FIXED_UPDATE = 7
 
     listeners = {CREATE: set(),
                  SPAWN: set(),
                  UPDATE: set(),
                  DESPAWN: set(),
-                 DESTROY: set()}
+                 DESTROY: set(),
+                 FIXED_UPDATE: set()}
+
+    by_gobj = {CREATE: {},
+               SPAWN: {},
+               UPDATE: {},
+               DESPAWN: {},
+               DESTROY: {},
+               FIXED_UPDATE: {}}
 
     def __init__(self, event_handler, type_id, gobj_id, force=False):
         super().__init__(event_handler, type_id, force)
         self.gobj_id = gobj_id
 
     def __new__(cls, event_handler, type_id, gobj_id, force=False):
-        return super().__new__(cls, event_handler, type_id, force)
+        """
+        Same as Listener.__new__(), but only the Listeners of the GameObject
+        with id 'gobj_id' are searched.
+        """
+        if isinstance(event_handler, EventHandler) and not force:
+            listener = cls.find_listener(event_handler, type_id, gobj_id)
+            if listener is not None:
+                return listener
+        return super().__new__(cls, event_handler, type_id, True)
+
+    def listen(self):
+        """Listen for the event of type with id 'self.type_id'"""
+        super().listen()
+        gobjs = self.__class__.by_gobj[self.type_id]
+        gobjs.setdefault(self.gobj_id, set()).add(self)
+
+    def ignore(self):
+        """Stop listening to the event of type with id 'self.type_id'"""
+        super().ignore()
+        gobjs = self.__class__.by_gobj[self.type_id]
+        listening = gobjs.get(self.gobj_id)
+        if listening is not None:
+            listening.discard(self)
+            if not listening:
+                del gobjs[self.gobj_id]
+
+    @classmethod
+    def find_listener(cls, event_handler, type_id, gobj_id=None):
+        """
+        Get a Listener instance that has the same 'event_handler' from all the
+        listeners listening to event with 'type_id' of the GameObject with id
+        'gobj_id' (of any GameObject if None).
+        If no Listener is found, return None.
+        """
+        if gobj_id is None:
+            return super().find_listener(event_handler, type_id)
+        for listener in cls.by_gobj[type_id].get(gobj_id, ()):
+            if listener.event_handler == event_handler:
+                return listener
+        return None
 
     def __eq__(self, other):
         super_eq = super().__eq__(other)
@@ -171,3 +243,63 @@ class GameObjectEventListener(Listener):
     def __hash__(self):
         return hash((self.event_handler, self.type_id, self.gobj_id,
                      self.forced))
+
+
+class TimerEventListener(Listener):
+    """
+    Listener that listens to TimerEvents, launched when a timer of the
+    engine.timers module expires.
+
+    Like the GameObjectEventListener, it is tied to the id of the timer that
+    launches the event ('timer_id') and listening TimerEventListeners are
+    indexed by event and timer id in the 'by_timer' dictionary, so an expiring
+    timer only reaches its own Listeners.
+    """
+
+    __slots__ = ('timer_id',)
+
+    EXPIRED = 0
+
+    listeners = {EXPIRED: set()}
+
+    by_timer = {EXPIRED: {}}
+
+    def __init__(self, event_handler, type_id, timer_id, force=False):
+        super().__init__(event_handler, type_id, force)
+        self.timer_id = timer_id
+
+    def __new__(cls, event_handler, type_id, timer_id, force=False):
+        """
+        Same as Listener.__new__(), but only the Listeners of the timer with
+        id 'timer_id' are searched.
+        """
+        if isinstance(event_handler, EventHandler) and not force:
+            for listener in cls.by_timer[type_id].get(timer_id, ()):
+                if listener.event_handler == event_handler:
+                    return listener
+        return super().__new__(cls, event_handler, type_id, True)
+
+    def listen(self):
+        """Listen for the event of type with id 'self.type_id'"""
+        super().listen()
+        timers = self.__class__.by_timer[self.type_id]
+        timers.setdefault(self.timer_id, set()).add(self)
+
+    def ignore(self):
+        """Stop listening to the event of type with id 'self.type_id'"""
+        super().ignore()
+        timers = self.__class__.by_timer[self.type_id]
+        listening = timers.get(self.timer_id)
+        if listening is not None:
+            listening.discard(self)
+            if not listening:
+                del timers[self.timer_id]
+
+    def __eq__(self, other):
+        super_eq = super().__eq__(other)
+        timer_id_eq = self.timer_id == other.timer_id
+        return super_eq and timer_id_eq
+
+    def __hash__(self):
+        return hash((self.event_handler, self.type_id, self.timer_id,
+                     self.forced))
@@ -1,7 +1,11 @@
 """Module that contains methods for launching events."""
 import engine.eventsys.listeners
+import engine.vars as gvars
 import copy
 
+_go_hooks = {}
+_NOWHERE = object()
+
 
 def launch(key, listener, data=None):
     """
@@ -14,15 +18,82 @@ def launch(key, listener, data=None):
         l.notify(data)
 
 
+def launch_scene(key, scene, data=None):
+    """
+    Launch a SceneEvent of type 'key' of the Scene 'scene' and pass the
+    EventData 'data'.
+
+    Only the SceneEventListeners that belong to 'scene' are notified: the
+    ones whose callback is a method of one of its GameObjects, of a
+    Component attached to one of them or of one of its coroutines. Components
+    not attached to a GameObject get no SceneEvent. Listeners that don't
+    belong to any Scene are notified of the events of the current Scene
+    only, once it is active: a Scene that is still loading (or whose loading
+    is cancelled) doesn't reach them.
+    """
+    listener_cls = engine.eventsys.listeners.SceneEventListener
+    listeners = copy.copy(listener_cls.listeners[key])
+    for l in listeners:
+        owner_scene = _scene_of(l.event_handler.owner)
+        if owner_scene is scene or (owner_scene is None and scene.active
+                                    and scene is gvars.current_scene):
+            l.notify(data)
+
+
+def _scene_of(owner):
+    """
+    Internal use: return the Scene of 'owner', a GameObject, a Component or
+    a coroutine, _NOWHERE if it is a Component not attached to a GameObject
+    and None if it doesn't belong to a Scene.
+    """
+    gobj = getattr(owner, 'gameobject', owner)
+    if gobj is None:
+        return _NOWHERE
+    return getattr(gobj, 'scene', None)
+
+
 def launch_go(key, gobj_id, data=None):
     """
     Launch a GameObjectEvent of type 'key' that the GameObjectEventListener
     class is listening to targeted to the GameObject with id 'go_id' and
-    pass to it the EventData 'data'.
+    pass to it the EventData 'data'. If a dispatch hook is set for 'key'
+    (see set_go_hook()), every Listener is notified through it.
     """
     # Safe in case variation of listener.-.listeners[key]
     listener = engine.eventsys.listeners.GameObjectEventListener
-    listeners = copy.copy(listener.listeners[key])
-    for l in listeners:
-        if l.gobj_id == gobj_id:
+    listeners = listener.by_gobj[key].get(gobj_id)
+    if not listeners:
+        return
+    hook = _go_hooks.get(key)
+    if hook is None:
+        for l in copy.copy(listeners):
             l.notify(data)
+    else:
+        for l in copy.copy(listeners):
+            hook(l, data)
+
+
+def set_go_hook(key, hook):
+    """
+    Notify the Listeners of the GameObjectEvents of type 'key' through
+    'hook', a function that takes in the Listener and the EventData and has
+    to call the Listener's notify() itself (for example to time it). Remove
+    the hook of 'key' if 'hook' is None.
+    """
+    if hook is None:
+        _go_hooks.pop(key, None)
+    else:
+        _go_hooks[key] = hook
+
+
+def launch_timer(key, timer_id, data=None):
+    """
+    Launch a TimerEvent of type 'key' of the timer with id 'timer_id' and
+    pass to its TimerEventListeners the EventData 'data'.
+    """
+    listener = engine.eventsys.listeners.TimerEventListener
+    listeners = listener.by_timer[key].get(timer_id)
+    if not listeners:
+        return
+    for l in copy.copy(listeners):
+        l.notify(data)
@@ -3,6 +3,7 @@ Module containing the GameObject class. For info on how a GameObject works,
 check the docs for the engine.gameobject.GameObject class
 """
 import engine.eventsys as evs
+import engine.timers as timers
 import engine.vars as gvars
 
 
@@ -16,8 +17,8 @@ class GameObject:
     nothing more than a list of Components that define its behaviour. Those
     Components are 'attached' to it.
 
-    The main attributes of a GameObject are its name, it gobj_id and its
-    Components.
+    The main attributes of a GameObject are its name, it gobj_id, its
+    Components and the Scene it belongs to.
 
     Every GameObject has a lifecycle and the various steps of this cycle are
     subscriptable events (the listener is the GameObjectEventListener). The
@@ -31,7 +32,12 @@ class GameObject:
     - SPAWN: The GameObject begins to update itself every time the Scene
       updates. The existence of all GameObjects and their components is
       guaranteed.
-    - UPDATE: The GameObject updates itself every Scene update.
+    - UPDATE: The GameObject updates itself every Scene update. Throttled
+      Behaviours (see Behaviour.update_interval()) are not subscribed to it:
+      the Scene updates them directly, every few frames.
+    - FIXED_UPDATE: The GameObject runs a fixed update every Scene fixed
+      update (only in the 'fixed' loop mode, see main module docs). Only the
+      Components that use it are subscribed to it.
     - DESPAWN: The GameObject stops updating itself, but is not yet destroyed.
       The existence of all GameObjects and their components is guaranteed.
     - DESTROY: Every Component is ripped out and the GameObject is deleted from
@@ -42,21 +48,35 @@ class GameObject:
     Components can be attached at scene load via the yaml files in the 'scenes'
     folder. They can also be added and removed dynamically via
     attach() and detach().
+
+    GameObjects declare '__slots__' to keep their memory footprint small:
+    arbitrary attributes cannot be set on them. Put the data in a Component
+    instead.
     """
 
+    __slots__ = ('gobj_id', 'name', 'spawned', 'components', 'scene')
+
     _listener = evs.GameObjectEventListener
     _scene_listener = evs.SceneEventListener
 
-    def __init__(self, name=None, components=None):
+    def __init__(self, name=None, components=None, create=True):
         """
         Constructor for GameObject. It initializes base attributes (name and
-        id) then attaches all Components and launches the CREATE event.
+        id) then attaches all Components and launches the CREATE event. If
+        'create' is False, the CREATE event is not launched: create() has to
+        be called (the SceneLoader does so to link every GameObject first).
         """
-        self.gobj_id = gvars.current_scene.register_gameobject(self)
+        self.scene = gvars.current_scene
+        self.gobj_id = self.scene.register_gameobject(self)
         self.name = name
         self.spawned = False
         self.components = []
         self.attach(components)
+        if create:
+            self.create()
+
+    def create(self):
+        """Launch the CREATE event"""
         evs.source.launch_go(self._listener.CREATE, self.gobj_id)
 
     def spawn(self):
@@ -72,6 +92,11 @@ class GameObject:
         if self.spawned:
             evs.source.launch_go(self._listener.UPDATE, self.gobj_id)
 
+    def fixed_update(self):
+        """Run a fixed update by launching the FIXED_UPDATE event"""
+        if self.spawned:
+            evs.source.launch_go(self._listener.FIXED_UPDATE, self.gobj_id)
+
     def despawn(self):
         """Despawn the GameObject and launch the DESPAWN event"""
         # Removed in favour of a boolean check to increase performance
@@ -82,12 +107,13 @@ class GameObject:
 
     def destroy(self):
         """
-        Launch DESTROY event, purge every Component and unregister from current
-        scene
+        Launch DESTROY event, purge every Component, cancel the timers of the
+        GameObject and unregister from its scene
         """
         evs.source.launch_go(self._listener.DESTROY, self.gobj_id)
         self._detach_all()
-        gvars.current_scene.unregister_gameobject(self.gobj_id)
+        timers.cancel_owned(self)
+        self.scene.unregister_gameobject(self.gobj_id)
 
     def attach(self, to_attach):
         """
@@ -111,12 +137,18 @@ class GameObject:
                        self._listener.CREATE, self.gobj_id).listen()
         self._listener(evs.EventHandler(component.on_spawn),
                        self._listener.SPAWN, self.gobj_id).listen()
-        self._listener(evs.EventHandler(component.on_component_update),
-                       self._listener.UPDATE, self.gobj_id).listen()
+        if component.update_interval() > 1:
+            self.scene.throttle(component, component.update_interval())
+        else:
+            self._listener(evs.EventHandler(component.on_component_update),
+                           self._listener.UPDATE, self.gobj_id).listen()
         self._listener(evs.EventHandler(component.on_despawn),
                        self._listener.DESPAWN, self.gobj_id).listen()
         self._listener(evs.EventHandler(component.on_destroy),
                        self._listener.DESTROY, self.gobj_id).listen()
+        if component.has_fixed_update():
+            self._listener(evs.EventHandler(component.on_fixed_update),
+                           self._listener.FIXED_UPDATE, self.gobj_id).listen()
         component.gameobject = self
         component.on_attach()
 
@@ -150,10 +182,16 @@ class GameObject:
                        self._listener.SPAWN, self.gobj_id).ignore()
         self._listener(evs.EventHandler(component.on_component_update),
                        self._listener.UPDATE, self.gobj_id).ignore()
+        self.scene.unthrottle(component)
         self._listener(evs.EventHandler(component.on_despawn),
                        self._listener.DESPAWN, self.gobj_id).ignore()
         self._listener(evs.EventHandler(component.on_destroy),
                        self._listener.DESTROY, self.gobj_id).ignore()
+        if component.has_fixed_update():
+            self._listener(evs.EventHandler(component.on_fixed_update),
+                           self._listener.FIXED_UPDATE, self.gobj_id).ignore()
+        self.scene.scheduler.stop_all(component)
+        timers.cancel_owned(component)
         component.on_detach(force)
         component.gameobject = None
 
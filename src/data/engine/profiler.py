@@ -0,0 +1,273 @@
+"""
+Useful docs to read for more information:
+ - main module
+
+Module containing the frame profiler, which measures how long each phase of
+every frame takes.
+
+The main loop marks the end of each phase of a frame with mark(): the time
+since the previous mark is recorded under the name of the phase. The phases
+are 'events' (the GameEvent loop), 'poll' (scene loading), 'timers' (see
+engine.timers), 'fixed_update', 'update' (Scenes and Behaviours), 'render'
+(engine.render.flush()), 'display' (pygame.display.update()) and 'tick' (the
+wait for the next frame). Each frame is then stored by end_frame() in a ring
+buffer of the last 'size' frames.
+
+If enabled with 'components' set to True, the time spent in the updates of
+each Component class is recorded too. The UPDATE and FIXED_UPDATE
+GameObjectEvents are then dispatched through a hook (see
+engine.eventsys.source.set_go_hook()) that times every Component, so it slows
+the game down a little more. Throttled Behaviours,
+updated by their Scene directly, are timed by the Scene with timed_update().
+
+The frames can be summarized (see stats()), exported as Chrome trace-event
+JSON (see export_trace(), the file opens in chrome://tracing or Perfetto) or
+shown in an overlay over the game (see toggle_overlay()).
+
+While the profiler is disabled, mark() and end_frame() return immediately and
+nothing is measured: a disabled profiler costs a few calls per frame and
+nothing per Component.
+"""
+from collections import deque
+import json
+import time
+
+import pygame
+
+import engine.eventsys as ev
+import engine.render
+from engine.assets import FontCache
+
+enabled = False
+overlay = False
+
+_frames = deque(maxlen=600)
+_phases = []
+_components = {}
+_frame_start = 0
+_last_mark = 0
+_timing = False
+
+_TIMED_EVENTS = (ev.GameObjectEventListener.UPDATE,
+                 ev.GameObjectEventListener.FIXED_UPDATE)
+_OVERLAY_POS = (4, 4)
+_OVERLAY_SIZE = 14
+
+
+class Frame:
+    """
+    A recorded frame: when it started and ended (seconds, from
+    time.perf_counter()), the list of its phases as (name, start, duration)
+    and a dictionary that maps each Component class name to the seconds spent
+    updating it.
+    """
+
+    __slots__ = ('start', 'end', 'phases', 'components')
+
+    def __init__(self, start, end, phases, components):
+        """
+        Constructor for Frame. Takes in the start and end of the frame, its
+        phases and its Component timings.
+        """
+        self.start = start
+        self.end = end
+        self.phases = phases
+        self.components = components
+
+    @property
+    def duration(self):
+        """Seconds taken by the frame"""
+        return self.end - self.start
+
+
+def enable(size=600, components=False):
+    """
+    Start recording the last 'size' frames. If 'components' is True, record
+    the update time of each Component class too.
+    """
+    global enabled, _frames, _frame_start, _last_mark, _timing
+    _frames = deque(maxlen=size)
+    _phases.clear()
+    _components.clear()
+    _frame_start = _last_mark = time.perf_counter()
+    if components and not _timing:
+        for key in _TIMED_EVENTS:
+            ev.source.set_go_hook(key, _timed_notify)
+        _timing = True
+    enabled = True
+
+
+def disable():
+    """Stop recording frames (the recorded ones are kept) and hide overlay"""
+    global enabled, _timing
+    if _timing:
+        for key in _TIMED_EVENTS:
+            ev.source.set_go_hook(key, None)
+        _timing = False
+    if overlay:
+        toggle_overlay()
+    enabled = False
+
+
+def mark(phase):
+    """End the phase 'phase' of the current frame"""
+    global _last_mark
+    if not enabled:
+        return
+    now = time.perf_counter()
+    _phases.append((phase, _last_mark, now - _last_mark))
+    _last_mark = now
+
+
+def end_frame():
+    """Store the current frame in the ring buffer and begin a new one"""
+    global _frame_start, _last_mark
+    if not enabled:
+        return
+    now = time.perf_counter()
+    _frames.append(Frame(_frame_start, now, list(_phases), dict(_components)))
+    _phases.clear()
+    _components.clear()
+    _frame_start = _last_mark = now
+
+
+def recording_components():
+    """Return True if the update time of each Component class is recorded"""
+    return _timing
+
+
+def timed_update(component):
+    """
+    Run the update of 'component' and record its time under its class, for
+    the Components that are updated without a GameObjectEvent
+    """
+    start = time.perf_counter()
+    try:
+        component.on_component_update()
+    finally:
+        _record(type(component).__name__, time.perf_counter() - start)
+
+
+def frames():
+    """Return the list of the recorded Frames, from the oldest"""
+    return list(_frames)
+
+
+def stats(top=5):
+    """
+    Return a dictionary that summarizes the recorded frames: 'frames' (how
+    many), 'fps', the 50th, 95th and 99th percentile of the frame time in ms
+    ('p50_ms', 'p95_ms', 'p99_ms'), the average ms of each phase ('phases')
+    and the 'top' Component classes that took the most average ms
+    ('components', a list of (name, ms)).
+    """
+    recorded = list(_frames)
+    if not recorded:
+        return {'frames': 0, 'fps': 0, 'p50_ms': 0, 'p95_ms': 0,
+                'p99_ms': 0, 'phases': {}, 'components': []}
+    durations = sorted(frame.duration * 1000 for frame in recorded)
+    phases = {}
+    components = {}
+    for frame in recorded:
+        for name, _, duration in frame.phases:
+            phases[name] = phases.get(name, 0) + duration
+        for name, duration in frame.components.items():
+            components[name] = components.get(name, 0) + duration
+    count = len(recorded)
+    total = recorded[-1].end - recorded[0].start
+    costliest = sorted(components.items(), key=lambda item: -item[1])[:top]
+    return {'frames': count,
+            'fps': count / total if total else 0,
+            'p50_ms': _percentile(durations, 50),
+            'p95_ms': _percentile(durations, 95),
+            'p99_ms': _percentile(durations, 99),
+            'phases': {name: seconds * 1000 / count
+                       for name, seconds in phases.items()},
+            'components': [(name, seconds * 1000 / count)
+                           for name, seconds in costliest]}
+
+
+def export_trace(path):
+    """
+    Write the recorded frames in the file at 'path' as Chrome trace-event
+    JSON: every frame and phase is a complete event and the Component
+    timings of each frame are a counter.
+    """
+    events = []
+    for frame in _frames:
+        events.append(_trace_event('frame', frame.start, frame.duration))
+        for name, start, duration in frame.phases:
+            events.append(_trace_event(name, start, duration))
+        if frame.components:
+            events.append({'name': 'components', 'ph': 'C', 'pid': 1,
+                           'tid': 1, 'ts': frame.start * 1e6,
+                           'args': {name: seconds * 1000 for name, seconds
+                                    in frame.components.items()}})
+    with open(path, 'w') as file:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+def toggle_overlay():
+    """
+    Show or hide the overlay with FPS, frame time percentiles and costliest
+    Components. main toggles it with F3 while the profiler is enabled.
+    """
+    global overlay
+    overlay = not overlay
+    if not overlay:
+        engine.render.redraw_all()
+
+
+def draw_overlay(screen):
+    """
+    Draw the overlay on 'screen', if shown. Return the Rect it covers, None
+    if not shown.
+    """
+    if not overlay:
+        return None
+    summary = stats(top=3)
+    lines = [f"FPS {summary['fps']:.1f}",
+             f"frame p50 {summary['p50_ms']:.2f} p95 {summary['p95_ms']:.2f} "
+             f"p99 {summary['p99_ms']:.2f} ms"]
+    lines.extend(f'{name} {ms:.2f} ms'
+                 for name, ms in summary['phases'].items())
+    lines.extend(f'{name} {ms:.3f} ms' for name, ms in summary['components'])
+    font = FontCache.get(None, _OVERLAY_SIZE)
+    surfaces = [font.render(line, True, (255, 255, 255)) for line in lines]
+    height = font.get_linesize()
+    rect = pygame.Rect(_OVERLAY_POS, (
+        max(surface.get_width() for surface in surfaces) + 8,
+        height * len(surfaces) + 8))
+    screen.fill((0, 0, 0), rect)
+    for i, surface in enumerate(surfaces):
+        screen.blit(surface, (rect.x + 4, rect.y + 4 + i * height))
+    return rect
+
+
+def _timed_notify(listener, event_data):
+    """
+    Internal use: dispatch hook of the timed GameObjectEvents while Component
+    timings are recorded.
+    """
+    start = time.perf_counter()
+    listener.notify(event_data)
+    _record(type(listener.event_handler.owner).__name__,
+            time.perf_counter() - start)
+
+
+def _record(name, seconds):
+    """Internal use: add 'seconds' to the time of the Component class 'name'"""
+    _components[name] = _components.get(name, 0) + seconds
+
+
+def _trace_event(name, start, duration):
+    """Internal use: return a complete trace event, times in seconds"""
+    return {'name': name, 'ph': 'X', 'pid': 1, 'tid': 1,
+            'ts': start * 1e6, 'dur': duration * 1e6}
+
+
+def _percentile(ordered, percent):
+    """Internal use: return the 'percent' percentile of sorted 'ordered'"""
+    index = round((len(ordered) - 1) * percent / 100)
+    return ordered[index]
+
@@ -0,0 +1,75 @@
+"""
+Useful docs to read for more information:
+ - engine.sceneloader module
+ - scene_data_doc file in 'scenes' folder
+
+Module containing the component registry, which maps short type names to
+Component classes, so that scene files can write 'type: Transform' instead of
+the '!!python/name:components.Transform' tag.
+
+Classes are registered by their path ('module.Class'): the module is imported
+only when a scene uses the type for the first time, so starting the game
+doesn't import Components that no scene needs. A type that isn't registered
+but is a path itself (it contains a dot) is imported the same way, so a new
+Component can be used without registering it.
+"""
+import importlib
+
+_paths = {'Transform': 'components.transform.Transform',
+          'BoxRenderer': 'behaviours.boxrenderer.BoxRenderer',
+          'CircleRenderer': 'behaviours.sphererenderer.CircleRenderer',
+          'TextRenderer': 'behaviours.textrenderer.TextRenderer',
+          'SpriteRenderer': 'behaviours.spriterenderer.SpriteRenderer'}
+_classes = {}
+
+
+def register(name, component):
+    """
+    Register the Component 'component', either a class or its path
+    ('module.Class'), with the short type name 'name'.
+    """
+    _classes.pop(name, None)
+    if isinstance(component, str):
+        _paths[name] = component
+    else:
+        _paths[name] = f'{component.__module__}.{component.__qualname__}'
+        _classes[name] = component
+
+
+def resolve(name):
+    """
+    Return the class with type name 'name', importing its module if it isn't
+    imported yet. Raise LookupError if the type is not registered and is not
+    the path of a class.
+    """
+    try:
+        return _classes[name]
+    except KeyError:
+        pass
+    path = _paths.get(name, name)
+    module_name, _, class_name = path.rpartition('.')
+    if not module_name:
+        raise LookupError(f'Unknown component type {name}')
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as e:
+        if not module_name.startswith(str(e.name)):
+            raise
+        raise LookupError(f'Cannot find module {module_name} of component '
+                          f'type {name}')
+    try:
+        cls = getattr(module, class_name)
+    except AttributeError:
+        raise LookupError(f'Cannot find {class_name} in module {module_name}')
+    _classes[name] = cls
+    return cls
+
+
+def names():
+    """Return the registered type names"""
+    return list(_paths)
+
+
+def paths():
+    """Return a dictionary that maps every registered type name to its path"""
+    return dict(_paths)
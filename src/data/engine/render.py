@@ -0,0 +1,299 @@
+"""
+Useful docs to read for more information:
+ - behaviours.renderer module
+
+Module containing the functions that draw a frame on the screen.
+
+Renderers don't blit on the SCREEN directly: during the update they submit()
+the Surface they want to draw, where (in world space) and on which layer. At
+the end of the frame the main loop calls flush(), which sorts everything that
+was submitted by layer and draws it with a single Surface.blits() call.
+Lower layers are drawn first, so higher layers are drawn on top of them;
+Surfaces on the same layer are drawn in the order they were submitted.
+Everything is drawn through the active Camera (engine.vars.CAMERA, see
+engine.camera module) and only inside its viewport; without a Camera, world
+and screen space are the same.
+
+The way a frame is drawn depends on the render mode (engine.vars.RENDER_MODE):
+- FULL ('full'): the screen is filled with FLUSH_COLOR, everything is drawn
+  again and the whole window is updated. Cheap when most of the screen changes
+  every frame;
+- DIRTY ('dirty'): what was drawn is compared with what was drawn in the last
+  frame. Only the regions covered by something that appeared, disappeared,
+  moved, changed Surface or changed layer are cleared and drawn again, and
+  only those are updated in the window. Mostly static scenes cost almost
+  nothing per frame. A Surface whose pixels change must be replaced by a new
+  Surface object (as the bundled renderers do) for the change to be seen.
+
+A layer can be marked static with set_static(): it is meant for scenery that
+never moves, like backgrounds and level geometry. Everything on a static layer
+is composited once into an off-screen Surface, which is then drawn with a
+single blit per frame. Renderers don't submit on static layers: they place()
+their Surface once and place it again only when it moves or changes, or
+withdraw() it, and the composite is rebuilt only then, so a static layer costs
+nothing per piece while it doesn't change. What is submitted on a static layer
+is composited too, and the composite is rebuilt when that changes. The
+composite is as big as the area covered by the layer, so keep on static
+layers only what really is static. Renderers on static layers are never
+culled, or scrolling would rebuild the composite.
+
+The pieces placed by the Components of a suspended Scene are parked (see
+park()), so they are not drawn until it is resumed.
+"""
+from operator import itemgetter
+import pygame
+
+import engine.vars as gvars
+
+FULL = 'full'
+DIRTY = 'dirty'
+
+_queue = []
+_last_frame = set()
+_redraw_all = True
+_damaged = []
+_static_layers = {}
+
+
+class _StaticLayer:
+    """
+    Internal use: the composite of a static layer. It holds the placed pieces
+    ('pieces', that maps each owner to its (Surface, position)), the parked
+    ones ('parked') and the set of (Surface, position) pairs submitted in the
+    last frame ('contents'). 'dirty' is True when the pieces changed.
+    """
+
+    __slots__ = ('pieces', 'parked', 'dirty', 'contents', 'surface', 'pos')
+
+    def __init__(self):
+        """Create an empty composite, that will be built at first use"""
+        self.pieces = {}
+        self.parked = {}
+        self.dirty = True
+        self.contents = frozenset()
+        self.surface = None
+        self.pos = None
+
+    def place(self, owner, surface, pos):
+        """Place (or move) the piece of 'owner'"""
+        self.pieces[owner] = (surface, (pos[0], pos[1]))
+        self.dirty = True
+
+    def withdraw(self, owner):
+        """Remove the piece of 'owner', placed or parked"""
+        if self.pieces.pop(owner, None) is not None:
+            self.dirty = True
+        self.parked.pop(owner, None)
+
+    def compose(self, items):
+        """
+        Return the composite Surface and its position, None if the layer is
+        empty. 'items' is the queue submitted on the layer in this frame. The
+        composite is rebuilt only if the pieces or 'items' changed.
+        """
+        contents = frozenset((surface, tuple(pos))
+                             for _, surface, pos in items)
+        if self.dirty or contents != self.contents:
+            self._build(list(self.pieces.values())
+                        + [(surface, pos) for _, surface, pos in items])
+            self.contents = contents
+            self.dirty = False
+        if self.surface is None:
+            return None
+        return self.surface, self.pos
+
+    def _build(self, pieces):
+        """Draw the (Surface, position) 'pieces' on a Surface big enough"""
+        if not pieces:
+            self.surface = self.pos = None
+            return
+        rects = [surface.get_rect(topleft=pos) for surface, pos in pieces]
+        bounds = rects[0].unionall(rects[1:])
+        self.surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        self.surface.blits([(surface, rect.move(-bounds.x, -bounds.y))
+                            for (surface, _), rect in zip(pieces, rects)],
+                           False)
+        self.pos = bounds.topleft
+
+
+def submit(surface, pos, layer=0):
+    """
+    Draw 'surface' with its top left corner at 'pos' on layer 'layer' in this
+    frame.
+    """
+    _queue.append((layer, surface, pos))
+
+
+def set_static(layer, static=True):
+    """Mark the layer 'layer' as static, or not static if 'static' is False"""
+    if not static:
+        _static_layers.pop(layer, None)
+    elif layer not in _static_layers:
+        _static_layers[layer] = _StaticLayer()
+
+
+def is_static(layer):
+    """Return True if the layer 'layer' is static"""
+    return layer in _static_layers
+
+
+def static_layer(layer):
+    """
+    Return the composite of the static layer 'layer', None if it isn't
+    static. Its place(owner, surface, pos) and withdraw(owner) methods add,
+    move and remove the piece of 'owner'. The composite of a layer changes
+    when the layer is set static again.
+    """
+    return _static_layers.get(layer)
+
+
+def park(owners):
+    """
+    Hide the pieces of static layers whose owner's id is in 'owners', until
+    unpark() is called with the same ids. Used by Scene.suspend().
+    """
+    for static in _static_layers.values():
+        for owner in [owner for owner in static.pieces if id(owner) in owners]:
+            static.parked[owner] = static.pieces.pop(owner)
+            static.dirty = True
+
+
+def unpark(owners):
+    """Show again the pieces hidden by park(). Used by Scene.resume()."""
+    for static in _static_layers.values():
+        for owner in [owner for owner in static.parked if id(owner) in owners]:
+            static.pieces[owner] = static.parked.pop(owner)
+            static.dirty = True
+
+
+def invalidate_static(layer):
+    """
+    Force the composite of the static layer 'layer' to be rebuilt in the next
+    frame. Only needed when a Surface on the layer is modified in place.
+    """
+    if layer in _static_layers:
+        _static_layers[layer].dirty = True
+
+
+def damage(rect):
+    """
+    Make the next frame clear and draw again the region 'rect' of the screen,
+    in the 'dirty' render mode. Needed when something drawn over the frame
+    outside of the engine.render module (like the profiler overlay) shrinks
+    or disappears.
+    """
+    _damaged.append(pygame.Rect(rect))
+
+
+def redraw_all():
+    """Make the next frame clear and draw the whole screen, in any mode"""
+    global _redraw_all
+    _redraw_all = True
+
+
+def flush(screen):
+    """
+    Draw everything submitted in this frame on 'screen' and empty the queue.
+
+    Return the list of Rects of the screen that changed, or None if the whole
+    screen changed. The return value is meant to be passed to
+    pygame.display.update().
+    """
+    global _last_frame, _redraw_all
+    if _static_layers:
+        _compose_static()
+    _queue.sort(key=itemgetter(0))
+    camera = gvars.CAMERA
+    if camera is None:
+        commands = [(surface, surface.get_rect(topleft=pos), layer)
+                    for layer, surface, pos in _queue]
+        view = screen.get_rect()
+    else:
+        commands = camera.project(_queue)
+        camera.refresh()
+        view = camera.viewport
+    _queue.clear()
+    damaged = _damaged[:]
+    _damaged.clear()
+    if gvars.RENDER_MODE != DIRTY:
+        _draw_full(screen, commands, view)
+        _redraw_all = True
+        return None
+    current = {(surface, tuple(rect), layer)
+               for surface, rect, layer in commands}
+    if _redraw_all:
+        _draw_full(screen, commands, view)
+        dirty = None
+    else:
+        dirty = _draw_dirty(screen, commands, current, view, damaged)
+    _last_frame = current
+    _redraw_all = False
+    return dirty
+
+
+def _compose_static():
+    """
+    Internal use: replace everything submitted on static layers in the queue
+    with the composite of each static layer.
+    """
+    composed = []
+    submitted = {}
+    for item in _queue:
+        if item[0] in _static_layers:
+            submitted.setdefault(item[0], []).append(item)
+        else:
+            composed.append(item)
+    for layer, static in _static_layers.items():
+        drawn = static.compose(submitted.get(layer, ()))
+        if drawn is not None:
+            composed.append((layer, drawn[0], drawn[1]))
+    _queue[:] = composed
+
+
+def _draw_full(screen, commands, view):
+    """
+    Internal use: clear the whole screen and draw every command inside the
+    Rect 'view'
+    """
+    screen.fill(gvars.FLUSH_COLOR)
+    screen.set_clip(view)
+    screen.blits([(surface, rect) for surface, rect, _ in commands], False)
+    screen.set_clip(None)
+
+
+def _draw_dirty(screen, commands, current, view, damaged):
+    """
+    Internal use: clear and draw only the regions inside the Rect 'view' that
+    changed since the last frame, or that are 'damaged', and return them.
+    'current' is the set of what is drawn in this frame.
+    """
+    changed = [rect for _, rect, _ in current ^ _last_frame] + damaged
+    dirty = _merge_rects(changed, view)
+    if not dirty:
+        return dirty
+    rects = [rect for _, rect, _ in commands]
+    for region in dirty:
+        screen.set_clip(region)
+        screen.fill(gvars.FLUSH_COLOR)
+        screen.blits([(commands[i][0], rects[i])
+                      for i in region.collidelistall(rects)], False)
+    screen.set_clip(None)
+    return dirty
+
+
+def _merge_rects(rects, bounds):
+    """
+    Internal use: clip 'rects' inside 'bounds' and merge the overlapping ones.
+    Return the list of merged Rects.
+    """
+    merged = []
+    for rect in rects:
+        rect = bounds.clip(rect)
+        if not rect.width or not rect.height:
+            continue
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect = rect.union(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
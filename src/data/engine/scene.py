@@ -3,9 +3,17 @@ Module containing the Scene class. For info on how a Scene works, check the
 docs for the engine.scene.Scene class.
 """
 import copy
+import itertools
 from collections import OrderedDict
 
 import engine.eventsys as ev
+import engine.profiler
+import engine.render
+import engine.timers as timers
+import engine.vars as gvars
+from engine.coroutines import Scheduler
+
+_ids = itertools.count()
 
 
 class Scene:
@@ -31,11 +39,43 @@ class Scene:
       are guaranteed to exist;
     - UPDATE: Every GameObject in the Scene is updated. Update is called
       directly by the main function at every game loop iteration;
+    - FIXED_UPDATE: Every GameObject in the Scene runs a fixed update. Called
+      by the main function at a fixed rate, only in the 'fixed' loop mode (see
+      main module docs);
+    - LOADED: Every GameObject has been created and spawned, the Scene has
+      finished loading (launched by the SceneLoader after ACTIVATE);
+    - SUSPEND: Scene is suspended, usually because another Scene was pushed
+      on top of it (see engine.sceneloader.push_scene()). It is not updated
+      and the GameEvent and SceneEvent Listeners, the timers (see
+      engine.timers) and the pieces of static render layers (see
+      engine.render) of its GameObjects and Components are parked (they stop
+      listening, running and being drawn) until it is resumed;
+    - RESUME: Scene is resumed: its Listeners listen again, its timers run
+      again with the time they had left, its pieces are drawn again and it is
+      updated again. SUSPEND and RESUME may occur multiple times;
     - DESTROY: Scene is deactivated, ready to be replaced by a new one.
 
+    The Scene updates and destroys its own GameObjects directly, after
+    launching the corresponding SceneEvent: GameObjects don't listen to
+    SceneEvents, so a Scene that is being loaded can exist along the current
+    one without being updated or destroyed with it. For the same reason
+    GameObject ids are unique across every Scene.
+
+    Throttled Behaviours (see Behaviour.update_interval()) are updated by the
+    Scene after its GameObjects. The Behaviours with the same interval of N
+    frames are split into N buckets, each new one in the bucket with the
+    fewest Behaviours, and every frame only one bucket is updated: the load
+    stays even across frames. While a bucket updates, DELTA_TIME is the time
+    passed since its last update.
+
+    Every Scene runs the coroutines of its Behaviours in its own 'scheduler'
+    (see engine.coroutines), advanced after its GameObjects are updated.
+
     Every step of the life cycle (except creation) is an event that other 
     objects can listen to. The listener for these events is the 
-    SceneEventListener.
+    SceneEventListener. The events of a Scene reach only the Listeners of its
+    own GameObjects and Components, so Scenes in the stack don't get each
+    other's events (see engine.eventsys.source.launch_scene()).
     """
 
     _listener = ev.SceneEventListener
@@ -49,6 +89,15 @@ class Scene:
         self.name = name
         self.gameobjects = OrderedDict()
         self.active = False
+        self.suspended = False
+        self.scheduler = Scheduler(self)
+        self.time = 0
+        self.frame = 0
+        self._parked = []
+        self._parked_timers = []
+        self._parked_owners = set()
+        self._throttled = {}
+        self._buckets = {}
 
         # self._gev_listener(ev.EventHandler(self.destroy),
         #                    self._gev_listener.QUIT).listen()
@@ -62,50 +111,158 @@ class Scene:
         if self.active:
             return
         self.active = True
-        ev.source.launch(self._listener.ACTIVATE, self._listener)
+        ev.source.launch_scene(self._listener.ACTIVATE, self)
 
     def update(self):
         """
         Called directly by the main function. Launch the UPDATE SceneEvent if
-        the Scene is active.
+        the Scene is active and not suspended.
+        """
+        if not self.active or self.suspended:
+            return
+        self.time += gvars.DELTA_TIME
+        ev.source.launch_scene(self._listener.UPDATE, self)
+        for gobj in list(self.gameobjects.values()):
+            gobj.update()
+        if self._throttled:
+            self._update_throttled()
+        self.frame += 1
+        self.scheduler.advance()
+
+    def fixed_update(self):
+        """
+        Called directly by the main function. Launch the FIXED_UPDATE
+        SceneEvent if the Scene is active and not suspended.
+        """
+        if not self.active or self.suspended:
+            return
+        ev.source.launch_scene(self._listener.FIXED_UPDATE, self)
+        for gobj in list(self.gameobjects.values()):
+            gobj.fixed_update()
+
+    def suspend(self):
+        """
+        Launch the SUSPEND SceneEvent, then stop updating the Scene and park
+        every GameEvent and SceneEvent Listener, every timer and every static
+        render piece that belongs to one of its GameObjects, Components or
+        coroutines (the Listeners of wait_event()).
         """
-        if not self.active:
+        if self.suspended:
             return
-        ev.source.launch(self._listener.UPDATE, self._listener)
+        ev.source.launch_scene(self._listener.SUSPEND, self)
+        self.suspended = True
+        owners = set()
+        for gobj in self.gameobjects.values():
+            owners.add(id(gobj))
+            owners.update(id(comp) for comp in gobj.components)
+        owners.update(id(coroutine)
+                      for coroutines in self.scheduler.owners.values()
+                      for coroutine in coroutines)
+        for listener_cls in (self._gev_listener, self._listener):
+            for listeners in listener_cls.listeners.values():
+                for listener in list(listeners):
+                    if id(listener.event_handler.owner) in owners:
+                        listener.ignore()
+                        self._parked.append(listener)
+        self._parked_timers = timers.park(owners)
+        engine.render.park(owners)
+        self._parked_owners = owners
+
+    def resume(self):
+        """
+        Make the parked Listeners listen again, schedule the parked timers
+        again, show the parked render pieces, update the Scene again and
+        launch the RESUME SceneEvent.
+        """
+        if not self.suspended:
+            return
+        for listener in self._parked:
+            listener.listen()
+        self._parked.clear()
+        timers.unpark(self._parked_timers)
+        self._parked_timers = []
+        engine.render.unpark(self._parked_owners)
+        self._parked_owners = set()
+        self.suspended = False
+        ev.source.launch_scene(self._listener.RESUME, self)
 
     def destroy(self):
         """
         Deactivate the scene, unsubscribe from all events and launch the
         DESTROY SceneEvent.
         """
-        ev.source.launch(self._listener.DESTROY, self._listener)
+        ev.source.launch_scene(self._listener.DESTROY, self)
+        timers.unpark(self._parked_timers)  # Cancelled with their Components
+        self._parked_timers = []
+        self._parked_owners = set()
+        for gobj_id, gobj in list(self.gameobjects.items()):
+            if gobj_id in self.gameobjects:  # Not destroyed by another one
+                gobj.destroy()
+        self.scheduler.clear()
+        self._parked.clear()
         self.active = False
         # self._gev_listener(ev.EventHandler(self.destroy),
         #                    self._gev_listener.QUIT).ignore()
 
+    def throttle(self, behaviour, interval):
+        """
+        Update 'behaviour' every 'interval' frames, in the bucket of that
+        interval with the fewest Behaviours
+        """
+        try:
+            buckets, last = self._throttled[interval]
+        except KeyError:
+            buckets = [{} for _ in range(interval)]
+            last = [self.time] * interval
+            self._throttled[interval] = (buckets, last)
+        index = min(range(interval), key=lambda i: len(buckets[i]))
+        buckets[index][behaviour] = None
+        self._buckets[behaviour] = (interval, index)
+
+    def unthrottle(self, behaviour):
+        """Stop updating 'behaviour', if throttled"""
+        try:
+            interval, index = self._buckets.pop(behaviour)
+        except KeyError:
+            return
+        del self._throttled[interval][0][index][behaviour]
+
+    def _update_throttled(self):
+        """
+        Internal use: update the bucket of this frame of every interval, with
+        DELTA_TIME set to the time passed since the bucket's last update.
+        The updates are timed if the profiler records Components.
+        """
+        delta_time = gvars.DELTA_TIME
+        timed = engine.profiler.recording_components()
+        try:
+            for interval, (buckets, last) in list(self._throttled.items()):
+                index = self.frame % interval
+                gvars.DELTA_TIME = self.time - last[index]
+                last[index] = self.time
+                for behaviour in list(buckets[index]):
+                    gobj = behaviour.gameobject
+                    if gobj is None or not gobj.spawned:
+                        continue
+                    if timed:
+                        engine.profiler.timed_update(behaviour)
+                    else:
+                        behaviour.on_component_update()
+        finally:
+            gvars.DELTA_TIME = delta_time
+
     def get_free_id(self):
-        """Get a free id from the scene's GameObject map."""
-        if not self.gameobjects:
-            return 0
-        return list(self.gameobject_ids())[-1] + 1
+        """Get a free id, never used by a GameObject of any Scene."""
+        return next(_ids)
 
     def register_gameobject(self, game_object):
         """Register 'game_object' in the scene's GameObject map"""
         new_id = self.get_free_id()
         self.gameobjects[new_id] = game_object
-        self._listener(ev.EventHandler(game_object.destroy),
-                       self._listener.DESTROY).listen()
-        self._listener(ev.EventHandler(game_object.update),
-                       self._listener.UPDATE).listen()
         return new_id
 
     def unregister_gameobject(self, gameobject_id):
         """Unregister 'game_object' from the scene's GameObject map"""
-        gobj = self.gameobjects[gameobject_id]
-        self._listener(ev.EventHandler(gobj.update),
-                       self._listener.UPDATE).ignore()
-        self._listener(ev.EventHandler(gobj.destroy),
-                       self._listener.DESTROY).ignore()
         del(self.gameobjects[gameobject_id])
 
     def gameobject_instances(self):
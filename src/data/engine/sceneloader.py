@@ -5,31 +5,167 @@ Useful docs to read for more information:
 Module containing functions responsible for loading and activating new Scenes
 from disk.
 
-Loaded scenes are cached in an OrderedDict with size '_cache_size'. The scene
-data is stored from older (first in dict) to newer (last in dict).
-
 Scene data is loaded using a YAML loader. The "typ='unsafe'" enables custom
 object tags (see ruamel.yaml docs). These tags are needed by the
-to properly parse GameObject Component data (see gameobject module docs)
+to properly parse GameObject Component data (see gameobject module docs).
+The type of a Component can also be a short name from the component registry
+(see engine.registry module docs). ruamel.yaml is imported only when the
+first YAML file is read: games that load only compiled scenes don't import it
+for their scenes.
+
+The raw YAML data is then compiled into a CompiledScene: every Component type
+is checked, every set of constructor arguments is validated against the
+Component's constructor and every link to another GameObject (see
+'scene_links' in the Component docs) is resolved. A CompiledScene is
+immutable: loading it only instantiates the GameObjects, without parsing or
+validating anything again.
+
+Compiled scenes are cached in the SceneCache, an OrderedDict that stores the
+scenes from the least (first in dict) to the most (last in dict) recently
+used. The cache is bound both by the number of scenes ('cache_size') and by
+their estimated memory ('max_bytes'): the size of the compiled or YAML file
+they were read from, measured where they are read so adding a scene doesn't
+serialize it again. Pinned scenes are never evicted. The cache counts its hits, misses and evictions (see
+SceneCache.stats()) to help tuning it; every limit can be set in config.yaml.
+
+Parsing YAML is slow, so a CompiledScene can also be saved next to its scene
+file, in a file with the same name and the COMPILED_SUFFIX extension (see
+build_compiled() and the compile_scenes.py script). The compiled file is a
+versioned pickle: it is used instead of the YAML file only if it has the
+current COMPILED_VERSION, it is not older than the YAML file and the
+constructor signature and links of every Component class it uses are the same
+as when it was compiled, so a change in the code of a Component makes the
+scene compile again from YAML. Like the
+YAML files loaded with "typ='unsafe'", compiled files can run arbitrary code
+when loaded, so they must come from a trusted source.
+
+Scenes can be preloaded on a background thread with preload(): the file is
+read and compiled without blocking the main loop, and the CompiledScene is
+added to the SceneCache by poll(), called by the main loop every frame.
+transition() preloads a scene and switches to it once it is ready, while the
+current scene keeps running; only the instantiation of the GameObjects
+happens on the main thread. Parsing is pure python, so while a scene is
+being parsed the frames are slower, but they are not blocked.
+
+To have every scene ready before the game needs it, warm_up() parses and
+compiles many scenes in parallel, in a pool of processes (one per CPU by
+default), and adds them to the SceneCache, writing their compiled files too.
+Errors are collected for each scene instead of stopping the warm-up.
+
+Instantiating a big scene can take many frames worth of time too, so it can
+be time sliced: if a 'budget' (in milliseconds, LOAD_BUDGET by default) is
+passed to load_scene(), the GameObjects are created and then spawned a few at
+a time, by poll(), spending no more than the budget each frame. While the new
+Scene is loading the current one keeps running, so it can show a loading
+screen (see loading_progress()); then it is destroyed and the new Scene is
+activated. Every load, time sliced or not, ends with the LOADED SceneEvent.
+
+Loading happens in four phases, each one begun only after the previous one
+is done for every GameObject:
+- construction: the GameObjects are created with their Components, but the
+  CREATE event is not launched yet;
+- linking: the 'scene_links' of every Component, resolved into GameObject
+  indexes when the scene was compiled, are passed to its on_link() method
+  (see the Component docs). Errors are raised as InvalidSceneData;
+- creation: the CREATE event is launched, so CREATE sees every GameObject and
+  every link;
+- spawning: the spawned GameObjects are spawned, so SPAWN sees every
+  GameObject created.
+Links that reference a GameObject that doesn't exist or form a cycle (see
+'acyclic_links' in the Component docs) are already reported when the scene is
+compiled, before any GameObject is constructed.
+
+Scenes can also be stacked: push_scene() loads a Scene on top of the current
+one (a pause menu on top of a level) and pop_scene() destroys it and resumes
+the one below, which kept all its GameObjects: returning to it costs nothing.
+The current Scene is the top of the stack; the Scenes below are suspended
+(see engine.scene.Scene.suspend()) unless the Scene on top of them was pushed
+as additive, in which case they keep being updated and drawn (a HUD on top of
+a level). load_scene() replaces the whole stack.
 """
+from collections import namedtuple
 from collections import OrderedDict
-import ruamel.yaml
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import inspect
+import multiprocessing
+import os
+import pickle
+import time
 
 from engine.scene import Scene
 from engine.gameobject import GameObject
+from engine.basecomponents import Component
+from engine.basecomponents import ComponentError
+import engine.eventsys as ev
+import engine.registry
 import engine.vars as gvars
 
 
+COMPILED_SUFFIX = '.s2dc'
+COMPILED_VERSION = 3
+_COMPILED_MAGIC = 'S2DE compiled scene'
+
+_executor = None
+_preloads = {}
+_transition = None
+_loading = None
+_stack = []
+
+CompiledScene = namedtuple('CompiledScene', ['name', 'gameobjects'])
+CompiledScene.__doc__ = """
+Compiled data of a Scene: its 'name' and the tuple of its CompiledGameObjects
+('gameobjects') in file order.
+"""
+
+CompiledGameObject = namedtuple('CompiledGameObject',
+                                ['name', 'spawned', 'components'])
+CompiledGameObject.__doc__ = """
+Compiled data of a GameObject: its 'name', whether it is 'spawned' at load and
+the tuple of its CompiledComponents ('components').
+"""
+
+CompiledComponent = namedtuple('CompiledComponent',
+                               ['type', 'args', 'copy_args', 'links'])
+CompiledComponent.__doc__ = """
+Compiled data of a Component: its class ('type'), the tuple of (name, value)
+constructor arguments ('args'), whether the arguments contain mutable values
+that need to be copied for every instance ('copy_args') and the tuple of
+(argument name, GameObject index) for each of its 'scene_links' ('links').
+"""
+
+
 class SceneCache:
-    """Static class that handles the scene cache"""
+    """Static class that handles the compiled scene cache"""
 
     cache = OrderedDict()
     cache_size = 10
+    max_bytes = 64 * 1024 * 1024
+    used_bytes = 0
+    sizes = {}
+    pinned = set()
+
+    hits = 0
+    misses = 0
+    evictions = 0
+
+    @classmethod
+    def get(cls, name):
+        """
+        Return the CompiledScene 'name' if cached (moving it to the last
+        place), None otherwise. Counts as a hit or a miss.
+        """
+        if name in cls.cache:
+            cls.hits += 1
+            return cls.extract(name)
+        cls.misses += 1
+        return None
 
     @classmethod
     def extract(cls, name):
         """
-        Get a copy of the data from cache, move it to the last place and return
+        Get the CompiledScene from cache, move it to the last place and return
         it.
         """
         data = cls.cache[name]
@@ -42,82 +178,713 @@ class SceneCache:
         cls.cache.move_to_end(name)
 
     @classmethod
-    def add(cls, name, data):
-        """Add a copy of 'data' with key 'name' to the cache and trim it"""
+    def add(cls, name, data, size=None):
+        """
+        Add the CompiledScene 'data' with key 'name', whose estimated size is
+        'size' bytes, and trim the cache. If 'size' is None, it is estimated
+        with scene_bytes(), which is slow for big scenes: the loaders pass the
+        size of the file the scene comes from instead.
+        """
+        cls.remove(name)
         cls.cache[name] = data
+        cls.sizes[name] = cls.scene_bytes(data) if size is None else size
+        cls.used_bytes += cls.sizes[name]
         cls.trim_cache()
 
+    @classmethod
+    def remove(cls, name):
+        """Remove the scene 'name' from the cache, if cached"""
+        if cls.cache.pop(name, None) is not None:
+            cls.used_bytes -= cls.sizes.pop(name)
+
     @classmethod
     def trim_cache(cls):
         """
-        Remove every item from older to newer until cache is of 'cache_size'
+        Remove every scene that isn't pinned from older to newer until the
+        cache holds no more than 'cache_size' scenes and 'max_bytes' bytes.
+        The newest scene is always kept.
         """
-        while True:
-            if len(cls.cache) > cls.cache_size:
-                cls.cache.popitem(last=False)
-            else:
+        for name in list(cls.cache)[:-1]:
+            if (len(cls.cache) <= cls.cache_size
+                    and cls.used_bytes <= cls.max_bytes):
                 break
+            if name not in cls.pinned:
+                cls.remove(name)
+                cls.evictions += 1
 
+    @classmethod
+    def pin(cls, name):
+        """Never evict the scene 'name' from the cache"""
+        cls.pinned.add(name)
+
+    @classmethod
+    def unpin(cls, name):
+        """Let the scene 'name' be evicted again and trim the cache"""
+        cls.pinned.discard(name)
+        cls.trim_cache()
+
+    @classmethod
+    def clear(cls):
+        """Remove every scene from the cache, even the pinned ones"""
+        cls.cache.clear()
+        cls.sizes.clear()
+        cls.used_bytes = 0
+
+    @classmethod
+    def stats(cls):
+        """
+        Return a dictionary with the number of hits, misses and evictions,
+        the number of cached scenes ('scenes') and the bytes they hold.
+        """
+        return {'hits': cls.hits, 'misses': cls.misses,
+                'evictions': cls.evictions, 'scenes': len(cls.cache),
+                'bytes': cls.used_bytes}
 
-def load_scene(name):
+    @classmethod
+    def reset_stats(cls):
+        """Set hits, misses and evictions back to 0"""
+        cls.hits = cls.misses = cls.evictions = 0
+
+    @staticmethod
+    def scene_bytes(data):
+        """Return the estimated size in bytes of the CompiledScene 'data'"""
+        return len(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+
+
+def load_scene(name, budget=None):
     """
-    Load data from cache/disk, parse it and create a new scene deactivated
-    empty scene and reference it . Then parse all the gameobjects using
-    GameObjectLoader (see the gameobjects docs), add them. Finally activate
-    the scene and spawn the GameObjects.
+    Load the CompiledScene from cache/disk and create a new deactivated empty
+    scene and reference it. Then instantiate all the gameobjects and add them.
+    Finally activate the scene and spawn the GameObjects.
 
     The name of the scene is the filename of the scene data file without
     the extension.
+
+    If 'budget' (LOAD_BUDGET if None) is greater than 0, the scene is loaded
+    by poll() across many frames, spending at most 'budget' milliseconds per
+    frame; any other time sliced load still going on is cancelled.
     """
-    destroy_current()
-    gvars.current_scene = Scene(name)
-    gos = _load_gameobjects(load_raw_data(name))
-    _spawn_gameobjects(gos)
-    gvars.current_scene.activate()
+    _start_load(name, budget)
 
 
-def load_raw_data(name):
+def push_scene(name, budget=None, additive=False):
+    """
+    Load the scene 'name' like load_scene(), but on top of the current one,
+    which is suspended instead of destroyed. If 'additive' is True, the
+    current Scene is not suspended: it keeps being updated below the new one.
+    """
+    _start_load(name, budget, push=True, additive=additive)
+
+
+def pop_scene():
+    """
+    Destroy the current Scene and resume the one below it in the stack,
+    which becomes the current one.
+    """
+    if not _stack:
+        raise IndexError('There is no scene below the current one')
+    gvars.current_scene.destroy()
+    gvars.current_scene = _stack.pop()
+    gvars.current_scene.resume()
+
+
+def scenes():
+    """Return the list of the loaded Scenes, from the bottom of the stack"""
+    if gvars.current_scene is None:
+        return list(_stack)
+    return _stack + [gvars.current_scene]
+
+
+def update_scenes():
+    """
+    Update every Scene of the stack, from the bottom to the current one
+    (suspended Scenes don't update).
+    """
+    for scene in _stack:
+        scene.update()
+    gvars.current_scene.update()
+
+
+def fixed_update_scenes():
+    """Like update_scenes(), but run a fixed update of every Scene"""
+    for scene in _stack:
+        scene.fixed_update()
+    gvars.current_scene.fixed_update()
+
+
+def _start_load(name, budget, push=False, additive=False):
     """
-    Load the raw scene data. If the scene exists in the '_cache' dict the
-    data stored inside the cache is used, else new data is loaded from disk
-    and stored in '_cache'
+    Internal use: begin loading the scene 'name', with 'budget' (LOAD_BUDGET
+    if None) milliseconds per frame. See _SceneLoad for 'push' and
+    'additive'.
     """
-    if name in SceneCache.cache:
-        return SceneCache.extract(name)
+    global _loading
+    if budget is None:
+        budget = gvars.LOAD_BUDGET
+    compiled = load_compiled(name)
+    cancel_loading()
+    if budget > 0:
+        _loading = _SceneLoad(compiled, budget / 1000, push, additive)
+        return
+    if not push:
+        destroy_current()
+    load = _SceneLoad(compiled, None, push, additive)
     try:
-        data = ruamel.yaml.YAML(typ='unsafe')\
-            .load(gvars.SCENE_PATH.joinpath(f'{name}.yaml'))
-    except ruamel.yaml.YAMLError:
-        raise InvalidSceneData("Malformed YAML file.")
-    SceneCache.add(name, data)
-    return data
+        load.advance()
+    except Exception:
+        load.cancel()
+        raise
 
 
-def _load_gameobjects(raw_data):
-    """Return the list of GameObjects read from raw_data"""
-    return [parse_gameobject(raw_go) for raw_go in raw_data]
+class _SceneLoad:
+    """
+    Internal use: the loading of a CompiledScene into a new Scene. The
+    GameObjects are created first and then spawned; advance() does as much of
+    this as its time budget allows.
 
+    When loaded, the new Scene replaces every loaded Scene or, if 'push' is
+    True, is pushed on top of the current one (which is suspended unless
+    'additive' is True).
+    """
 
-def _spawn_gameobjects(gos):
-    """For each GameObject in the current scene, call the spawn method"""
-    for go_data in gos:
-        if go_data[1]:
-            go_data[0].spawn()
+    __slots__ = ('compiled', 'budget', 'push', 'additive', 'scene', 'gos',
+                 'done')
+
+    def __init__(self, compiled, budget=None, push=False, additive=False):
+        """
+        Constructor for _SceneLoad. Takes in the CompiledScene to load, the
+        seconds that each call of advance() can take ('budget', no limit if
+        None) and how the new Scene is added ('push' and 'additive').
+        """
+        self.compiled = compiled
+        self.budget = budget
+        self.push = push
+        self.additive = additive
+        self.scene = Scene(compiled.name)
+        self.gos = []
+        self.done = 0
+
+    @property
+    def progress(self):
+        """Fraction of the loading that is done, from 0 to 1"""
+        total = len(self._PHASES) * len(self.compiled.gameobjects)
+        if not total:
+            return 1.0
+        return self.done / total
+
+    def advance(self):
+        """
+        Go on with the phases of the loading (see the module docs) until
+        everything is loaded or the budget is over. When everything is
+        loaded, destroy (or push down) the current scene and activate the new
+        one. Return True if the loading is complete.
+
+        While working, the new Scene is the current one, so that the
+        GameObjects are registered in it and can find each other.
+        """
+        deadline = None
+        if self.budget is not None:
+            deadline = time.perf_counter() + self.budget
+        previous = gvars.current_scene
+        gvars.current_scene = self.scene
+        try:
+            done = self._run(deadline)
+        finally:
+            gvars.current_scene = previous
+        if done:
+            if not self.push:
+                destroy_current()
+            elif gvars.current_scene is not None:
+                if not self.additive:
+                    gvars.current_scene.suspend()
+                _stack.append(gvars.current_scene)
+            gvars.current_scene = self.scene
+            self.scene.activate()
+            ev.source.launch_scene(ev.SceneEventListener.LOADED, self.scene)
+        return done
+
+    def cancel(self):
+        """
+        Destroy the GameObjects created so far. The DESTROY SceneEvent
+        reaches only the Listeners of the new Scene, never those of the Scene
+        still running.
+        """
+        previous = gvars.current_scene
+        gvars.current_scene = self.scene
+        try:
+            self.scene.destroy()
+        finally:
+            gvars.current_scene = previous
+
+    def _run(self, deadline):
+        """
+        Internal use: run the phases one GameObject at a time until the
+        'deadline' (no limit if None), return True when all are done.
+        """
+        count = len(self.compiled.gameobjects)
+        while self.done < len(self._PHASES) * count:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            phase, index = divmod(self.done, count)
+            self._PHASES[phase](self, index)
+            self.done += 1
+        return True
+
+    def _construct(self, index):
+        """Internal use: construct the GameObject 'index' without CREATE"""
+        self.gos.append(instantiate_gameobject(
+            self.compiled.gameobjects[index], create=False))
+
+    def _link(self, index):
+        """Internal use: pass to the Components of 'index' their links"""
+        gobj = self.gos[index][0]
+        compiled_go = self.compiled.gameobjects[index]
+        for comp, compiled_comp in zip(gobj.components,
+                                       compiled_go.components):
+            if not compiled_comp.links:
+                continue
+            links = {arg: self.gos[target][0]
+                     for arg, target in compiled_comp.links}
+            try:
+                comp.on_link(**links)
+            except ComponentError as e:
+                raise InvalidSceneData(str(e), self.compiled.name)
+
+    def _create(self, index):
+        """Internal use: launch the CREATE event of 'index'"""
+        self.gos[index][0].create()
+
+    def _spawn(self, index):
+        """Internal use: spawn 'index', if it has to be spawned"""
+        gobj, spawned = self.gos[index]
+        if spawned:
+            gobj.spawn()
+
+    _PHASES = (_construct, _link, _create, _spawn)
+
+
+def loading_progress():
+    """
+    Return the fraction (from 0 to 1) of the time sliced load that is going
+    on, None if no scene is loading.
+    """
+    if _loading is None:
+        return None
+    return _loading.progress
+
+
+def cancel_loading():
+    """Stop the time sliced load that is going on, if any"""
+    global _loading
+    if _loading is not None:
+        loading, _loading = _loading, None
+        loading.cancel()
+
+
+def load_compiled(name):
+    """
+    Return the CompiledScene with name 'name'. If the scene exists in the
+    SceneCache the cached one is used, else the scene is read from its
+    compiled file (if up to date) or loaded from its YAML file and compiled.
+    The CompiledScene is then stored in the SceneCache.
+    """
+    compiled = SceneCache.get(name)
+    if compiled is not None:
+        return compiled
+    if name in _preloads:
+        compiled, size = _preloads.pop(name).result()
+    else:
+        compiled, size = _read_or_compile(name)
+    SceneCache.add(name, compiled, size)
+    return compiled
+
+
+def _read_or_compile(name):
+    """
+    Internal use: return the CompiledScene of the scene 'name' from its
+    compiled file or, if not usable, from its YAML file, along with its
+    estimated size in bytes: the size of the file it comes from.
+    """
+    compiled = read_compiled(name)
+    if compiled is not None:
+        return compiled, compiled_path(name).stat().st_size
+    compiled = compile_scene(name, load_raw_data(name))
+    return compiled, \
+        gvars.SCENE_PATH.joinpath(f'{name}.yaml').stat().st_size
+
+
+def preload(name):
+    """
+    Start reading and compiling the scene 'name' on a background thread, if
+    it is not cached or being preloaded already. The CompiledScene will be
+    added to the SceneCache by poll().
+    """
+    global _executor
+    if name in SceneCache.cache or name in _preloads:
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1)
+    _preloads[name] = _executor.submit(_read_or_compile, name)
+
+
+def transition(name):
+    """
+    Switch to the scene 'name' as soon as it is ready: the scene is preloaded
+    in the background and the current scene keeps running until poll() finds
+    it ready and loads it.
+    """
+    global _transition
+    preload(name)
+    _transition = name
+
+
+def is_ready(name):
+    """Return True if the scene 'name' can be loaded without parsing it"""
+    if name in _preloads:
+        return _preloads[name].done()
+    return name in SceneCache.cache
+
+
+def poll():
+    """
+    Add the scenes whose preload has finished to the SceneCache and, if a
+    transition() is pending and its scene is ready, load it. Then continue
+    the time sliced load, if any. Called by the main loop every frame.
+
+    Errors raised while preloading or loading a scene (like InvalidSceneData)
+    are raised here.
+    """
+    global _transition, _loading
+    for name in [name for name, future in _preloads.items() if future.done()]:
+        SceneCache.add(name, *_preloads.pop(name).result())
+    if _transition is not None and is_ready(_transition):
+        name = _transition
+        _transition = None
+        load_scene(name)
+    if _loading is not None:
+        try:
+            done = _loading.advance()
+        except Exception:
+            cancel_loading()
+            raise
+        if done:
+            _loading = None
+
+
+def scene_names():
+    """Return the sorted names of every scene file in SCENE_PATH"""
+    return sorted(path.stem for path in gvars.SCENE_PATH.glob('*.yaml'))
+
+
+def warm_up(names=None, workers=None, write=True):
+    """
+    Parse and compile the scenes 'names' (every scene in SCENE_PATH if None)
+    in parallel, in 'workers' processes (one per CPU if None), and add them
+    to the SceneCache. Scenes with an up to date compiled file are read from
+    it instead; the others have their compiled file written, if 'write' is
+    True. With one worker or one scene, everything is done in this process.
+    The worker processes are forked where possible and get the registered
+    component types in any case (see _init_worker()). Call it before the
+    display is initialized, so forked workers don't inherit the window.
+
+    Return a dictionary that maps the name of each scene that failed to its
+    error (InvalidSceneData or OSError).
+    """
+    if names is None:
+        names = scene_names()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    jobs = [(gvars.SCENE_PATH, name, write) for name in names]
+    if workers == 1 or len(jobs) < 2:
+        results = [_warm_up_scene(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(min(workers, len(jobs)),
+                                 mp_context=_worker_context(),
+                                 initializer=_init_worker,
+                                 initargs=(engine.registry.paths(),)) as pool:
+            results = list(pool.map(_warm_up_scene, *zip(*jobs)))
+    errors = {}
+    for name, (compiled, size, error) in zip(names, results):
+        if error is None:
+            SceneCache.add(name, compiled, size)
+        else:
+            errors[name] = error
+    return errors
+
+
+def _worker_context():
+    """
+    Internal use: return the multiprocessing context of the warm_up()
+    workers: fork if the platform has it, so the workers share the imported
+    modules and the classes registered at runtime, else the default one
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _init_worker(paths):
+    """
+    Internal use: register the component types 'paths' (see
+    engine.registry.paths()) in a warm_up() worker, for the start methods
+    that don't copy the registry of the game
+    """
+    for name, path in paths.items():
+        if name not in engine.registry.names():
+            engine.registry.register(name, path)
+
+
+def _warm_up_scene(scene_path, name, write):
+    """
+    Internal use: get the CompiledScene of the scene 'name' in 'scene_path'
+    for warm_up(), in a worker process. Return a tuple with the CompiledScene,
+    its size in bytes and None, or None, None and the error.
+    """
+    gvars.SCENE_PATH = scene_path
+    try:
+        compiled = read_compiled(name)
+        if compiled is not None:
+            size = compiled_path(name).stat().st_size
+        elif write:
+            compiled = compile_scene(name, load_raw_data(name))
+            size = write_compiled(compiled)
+        else:
+            compiled = compile_scene(name, load_raw_data(name))
+            size = SceneCache.scene_bytes(compiled)
+    except (InvalidSceneData, OSError) as e:
+        return None, None, e
+    return compiled, size, None
+
+
+def shutdown():
+    """Cancel every pending preload and stop the background thread"""
+    global _executor
+    for future in _preloads.values():
+        future.cancel()
+    _preloads.clear()
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
+
+def compiled_path(name):
+    """Return the path of the compiled file of the scene 'name'"""
+    return gvars.SCENE_PATH.joinpath(f'{name}{COMPILED_SUFFIX}')
+
+
+def read_compiled(name):
+    """
+    Return the CompiledScene stored in the compiled file of the scene 'name'.
+    Return None if the file doesn't exist, is older than the YAML file, has
+    another version, cannot be read or a Component class it uses has changed
+    signature or links.
+    """
+    path = compiled_path(name)
+    source = gvars.SCENE_PATH.joinpath(f'{name}.yaml')
+    try:
+        compiled_mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    try:
+        if source.stat().st_mtime_ns > compiled_mtime:
+            return None
+    except OSError:
+        pass  # Only the compiled file is shipped
+    try:
+        with path.open('rb') as file:
+            magic, version, signatures, compiled = pickle.load(file)
+    except Exception:
+        return None
+    if magic != _COMPILED_MAGIC or version != COMPILED_VERSION:
+        return None
+    try:
+        if any(_signature(typ) != signature
+               for typ, signature in signatures.items()):
+            return None
+    except (TypeError, ValueError):
+        return None
+    return compiled
+
+
+def build_compiled(name):
+    """
+    Compile the YAML file of the scene 'name' and save the CompiledScene in
+    its compiled file. Return the CompiledScene.
+    """
+    compiled = compile_scene(name, load_raw_data(name))
+    write_compiled(compiled)
+    return compiled
+
+
+def write_compiled(compiled):
+    """
+    Save the CompiledScene 'compiled' in its compiled file and return the
+    size of the file
+    """
+    with compiled_path(compiled.name).open('wb') as file:
+        pickle.dump((_COMPILED_MAGIC, COMPILED_VERSION,
+                     _signatures(compiled), compiled), file,
+                    pickle.HIGHEST_PROTOCOL)
+        return file.tell()
+
+
+def _signatures(compiled):
+    """
+    Internal use: return a dictionary that maps every Component class used
+    by the CompiledScene 'compiled' to its _signature()
+    """
+    types = {comp.type for go in compiled.gameobjects
+             for comp in go.components}
+    return {typ: _signature(typ) for typ in types}
+
+
+def _signature(typ):
+    """
+    Internal use: return what a CompiledComponent of the class 'typ' relies
+    on: its constructor signature and its links
+    """
+    return (str(inspect.signature(typ)), tuple(typ.scene_links),
+            tuple(typ.acyclic_links))
+
+
+def load_raw_data(name):
+    """Load the raw scene data of the scene 'name' from disk"""
+    import ruamel.yaml
+    try:
+        return ruamel.yaml.YAML(typ='unsafe')\
+            .load(gvars.SCENE_PATH.joinpath(f'{name}.yaml'))
+    except ruamel.yaml.YAMLError:
+        raise InvalidSceneData("Malformed YAML file.", name)
+
+
+def compile_scene(name, raw_data):
+    """
+    Compile 'raw_data', the raw data of the scene 'name', into a
+    CompiledScene. Raise InvalidSceneData if the data is not valid.
+    """
+    if raw_data is None:
+        raw_data = []
+    if not isinstance(raw_data, list):
+        raise InvalidSceneData('scene data is not a sequence of GameObjects',
+                               name)
+    try:
+        gos = tuple(_compile_gameobject(raw_go) for raw_go in raw_data)
+        gos = _compile_links(gos)
+    except InvalidSceneData as e:
+        e.scene_name = name
+        raise
+    return CompiledScene(name, gos)
 
 
 def destroy_current():
-    """Destroy the currently loaded Scene."""
+    """
+    Destroy the currently loaded Scene and every Scene below it in the
+    stack.
+    """
     if gvars.current_scene is not None:
         gvars.current_scene.destroy()
     gvars.current_scene = None
+    while _stack:
+        _stack.pop().destroy()
 
 
 def parse_gameobject(raw_go_data):
     """Parse GameObject from 'raw_go_data'"""
+    return instantiate_gameobject(_compile_gameobject(raw_go_data))
+
+
+def instantiate_gameobject(compiled_go, create=True):
+    """
+    Create the GameObject described by the CompiledGameObject 'compiled_go'.
+    Return it along with a bool that is True if it has to be spawned. If
+    'create' is False, the CREATE event is not launched (see
+    GameObject.create()).
+    """
+    comps = []
+    for comp in compiled_go.components:
+        args = dict(comp.args)
+        if comp.copy_args:
+            args = copy.deepcopy(args)
+        comps.append(comp.type(**args))
+    return GameObject(compiled_go.name, comps, create), compiled_go.spawned
+
+
+def _compile_gameobject(raw_go_data):
+    """Compile a CompiledGameObject from 'raw_go_data'"""
+    if not isinstance(raw_go_data, dict):
+        raise InvalidSceneData('GameObject data is not a dictionary')
     go_name = _parse_name(raw_go_data)
     go_spawned = _parse_spawned(raw_go_data)
     go_comps = _parse_components(raw_go_data)
-    return GameObject(go_name, go_comps), go_spawned
+    return CompiledGameObject(go_name, go_spawned, go_comps)
+
+
+def _compile_links(gos):
+    """
+    Resolve the 'scene_links' of every Component of the CompiledGameObjects
+    'gos' into the index of the linked GameObject and check that the
+    'acyclic_links' don't form cycles. Return the new tuple of
+    CompiledGameObjects.
+    """
+    names = {}
+    for i, go in enumerate(gos):
+        names.setdefault(go.name, i)
+    linked = []
+    acyclic = {}
+    for i, go in enumerate(gos):
+        comps = []
+        for comp in go.components:
+            links = []
+            for arg, target in comp.args:
+                if arg not in comp.type.scene_links or \
+                        not isinstance(target, str):
+                    continue
+                if target not in names:
+                    raise InvalidSceneData(f'GameObject {target}, linked by '
+                                           f'{arg} in {go.name}, does not '
+                                           'exist')
+                links.append((arg, names[target]))
+                if arg in comp.type.acyclic_links:
+                    acyclic.setdefault(arg, {}).setdefault(i, []) \
+                        .append(names[target])
+            comps.append(comp._replace(links=tuple(links)))
+        linked.append(go._replace(components=tuple(comps)))
+    for arg, edges in acyclic.items():
+        cycle = _find_cycle(edges)
+        if cycle is not None:
+            path = ' -> '.join(gos[i].name for i in cycle + cycle[:1])
+            raise InvalidSceneData(f'{arg} links form a cycle: {path}')
+    return tuple(linked)
+
+
+def _find_cycle(edges):
+    """
+    Return the list of nodes of a cycle of the graph 'edges' (a dictionary
+    that maps each node to the list of nodes it links to), None if there
+    are no cycles.
+    """
+    visited = set()
+    for root in edges:
+        if root in visited:
+            continue
+        visited.add(root)
+        path = [root]
+        on_path = {root}
+        stack = [iter(edges[root])]
+        while stack:
+            for target in stack[-1]:
+                if target in on_path:
+                    return path[path.index(target):]
+                if target not in visited:
+                    visited.add(target)
+                    path.append(target)
+                    on_path.add(target)
+                    stack.append(iter(edges.get(target, ())))
+                    break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+    return None
 
 
 def _parse_name(raw_go_data):
@@ -145,25 +912,54 @@ def _parse_spawned(raw_go_data):
 
 
 def _parse_components(raw_go_data):
-    """Parse every Component from 'raw_go_data' and return it into a list"""
+    """Parse every Component from 'raw_go_data' and return it into a tuple"""
     comps_key = 'components'
     try:
-        return [_parse_component(c_data) for c_data in raw_go_data[comps_key]]
+        raw_comps = raw_go_data[comps_key]
     except KeyError:
         raise InvalidSceneData(f'{comps_key} is not present in a GameObject')
-    except (TypeError, AttributeError):
+    if not isinstance(raw_comps, list) or \
+            not all(isinstance(c, dict) for c in raw_comps):
         raise InvalidSceneData(f'{comps_key} does not contain the proper '
                                'value')
+    return tuple(_parse_component(c_data) for c_data in raw_comps)
 
 
 def _parse_component(raw_comp_data):
-    """Parse a Component object from 'raw_comp_data'"""
+    """
+    Parse a CompiledComponent from 'raw_comp_data', validating the type and
+    the constructor arguments. 'raw_comp_data' is left untouched.
+    """
     type_key = 'type'
     try:
-        typ = raw_comp_data.pop(type_key)
-        return typ(**raw_comp_data)
+        typ = raw_comp_data[type_key]
     except KeyError:
         raise InvalidSceneData("Component is missing the 'type' key")
+    if isinstance(typ, str):
+        try:
+            typ = engine.registry.resolve(typ)
+        except LookupError as e:
+            raise InvalidSceneData(str(e))
+    if not isinstance(typ, type) or not issubclass(typ, Component):
+        raise InvalidSceneData(f'{typ} is not a Component')
+    args = {key: value for key, value in raw_comp_data.items()
+            if key != type_key}
+    try:
+        inspect.signature(typ).bind(**args)
+    except TypeError as e:
+        raise InvalidSceneData(f'invalid arguments for {typ.__name__}: {e}')
+    copy_args = not all(_is_immutable(value) for value in args.values())
+    if copy_args:
+        args = copy.deepcopy(args)
+    return CompiledComponent(typ, tuple(args.items()), copy_args, ())
+
+
+def _is_immutable(value):
+    """Return True if 'value' can be shared by many Components safely"""
+    if isinstance(value, tuple):
+        return all(_is_immutable(item) for item in value)
+    return value is None or isinstance(value, (bool, int, float, complex, str,
+                                               bytes, frozenset, type))
 
 
 class InvalidSceneData(Exception):
@@ -179,7 +975,7 @@ class InvalidSceneData(Exception):
         the error message, a optionally the name 'scene_name' whose data caused
         the error.
         """
-        super().__init__()
+        super().__init__(message, scene_name)
         self.message = message
         self.scene_name = scene_name
 
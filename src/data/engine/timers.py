@@ -0,0 +1,272 @@
+"""
+Useful docs to read for more information:
+ - engine.eventsys package
+ - main module
+
+Module containing the timer service of the engine, for delays, cooldowns and
+periodic tasks that don't need a countdown in an update.
+
+after(seconds, event_handler) executes the EventHandler 'event_handler' once,
+'seconds' seconds from now; every(seconds, event_handler) executes it every
+'seconds' seconds. Both return a Timer, that can be cancelled with its
+cancel() method (or with cancel()). The EventHandler gets an EventData with
+the Timer ('timer') and how many seconds late it is executed ('late').
+
+Expired timers are delivered through the event system: every Timer has an id
+('timer_id') and its EventHandler listens to the EXPIRED TimerEvent of that
+id with a TimerEventListener, which the Timer keeps listening until it is
+cancelled or finished. Other TimerEventListeners can listen to the same timer
+too.
+
+The timers run on the game time: advance() is called once per frame by the
+main loop, with DELTA_TIME. A periodic timer that misses some periods (a very
+slow frame) is executed once and then waits for its next period, so it never
+runs many times in a row to catch up.
+
+Timers are kept in a heap ordered by when they are due: scheduling one is
+O(log n) and only the due ones are looked at every frame, so waiting timers
+cost nothing. A cancelled timer is only marked and is thrown away when it
+reaches the top of the heap; when cancelled (or parked) timers are more than
+half of the heap, it is rebuilt without them.
+
+The timers of a Component or GameObject (whose EventHandler calls one of its
+methods) are cancelled when it is detached or destroyed. When its Scene is
+suspended they are parked (see park()): they don't run, and the time they
+have left is kept until the Scene is resumed, like the coroutines of the
+Scene.
+"""
+import heapq
+import itertools
+
+import engine.eventsys as ev
+import engine.vars as gvars
+
+time = 0
+
+_heap = []
+_order = itertools.count()
+_ids = itertools.count()
+_owners = {}
+_stale = 0
+_parked = 0
+
+_EXPIRED = ev.TimerEventListener.EXPIRED
+
+
+class Timer:
+    """
+    A scheduled timer: the game time at which it is due ('due'), its period in
+    seconds ('interval', None if it runs once), the EventHandler executed
+    ('event_handler'), its id ('timer_id') and the TimerEventListener of the
+    EventHandler ('listener').
+    """
+
+    __slots__ = ('due', 'interval', 'event_handler', 'cancelled', 'timer_id',
+                 'listener', '_seq')
+
+    def __init__(self, due, interval, event_handler):
+        """
+        Constructor for Timer. Takes in when it is due, its period and its
+        EventHandler.
+        """
+        self.due = due
+        self.interval = interval
+        self.event_handler = event_handler
+        self.cancelled = False
+        self.timer_id = next(_ids)
+        self.listener = None
+        self._seq = None
+
+    def cancel(self):
+        """Cancel the timer: its EventHandler won't be executed anymore"""
+        cancel(self)
+
+
+def after(seconds, event_handler):
+    """
+    Execute the EventHandler 'event_handler' once after 'seconds' seconds and
+    return its Timer.
+    """
+    return _schedule(Timer(time + seconds, None, event_handler))
+
+
+def every(seconds, event_handler):
+    """
+    Execute the EventHandler 'event_handler' every 'seconds' seconds and
+    return its Timer. Raise ValueError if 'seconds' isn't positive.
+    """
+    if seconds <= 0:
+        raise ValueError(f'Invalid timer period {seconds}')
+    return _schedule(Timer(time + seconds, seconds, event_handler))
+
+
+def cancel(timer):
+    """Cancel 'timer', if it isn't cancelled or finished yet"""
+    if timer.cancelled:
+        return
+    timer.cancelled = True
+    _forget(timer)
+    _unqueue(timer)
+
+
+def cancel_owned(owner):
+    """
+    Cancel every timer whose EventHandler is a method of 'owner'. Called when
+    a Component is detached and when a GameObject is destroyed.
+    """
+    for timer in list(_owners.get(id(owner), ())):
+        cancel(timer)
+
+
+def park(owners):
+    """
+    Take out of the heap every timer whose EventHandler is a method of an
+    object whose id is in 'owners' and return them, with the seconds they
+    had left, to be passed to unpark(). Used by Scene.suspend().
+    """
+    global _parked
+    parked = []
+    for owner in owners:
+        for timer in _owners.get(owner, ()):
+            if timer._seq is not None:
+                parked.append((timer, timer.due - time))
+                _unqueue(timer)
+    _parked += len(parked)
+    return parked
+
+
+def unpark(parked):
+    """
+    Schedule again the timers returned by park(), with the seconds they had
+    left. Used by Scene.resume().
+    """
+    global _parked
+    _parked -= len(parked)
+    for timer, left in parked:
+        if not timer.cancelled:
+            timer.due = time + left
+            _push(timer)
+
+
+def advance(delta_time=None):
+    """
+    Advance the game time by 'delta_time' seconds (DELTA_TIME if None) and
+    launch the EXPIRED TimerEvent of the timers that are due, in order.
+    Timers scheduled while advancing expire at the next advance at the
+    earliest.
+    """
+    global time, _stale
+    if delta_time is None:
+        delta_time = gvars.DELTA_TIME
+    time += delta_time
+    due = []
+    while _heap and _heap[0][0] <= time:
+        _, seq, timer = heapq.heappop(_heap)
+        if seq != timer._seq:  # Cancelled or parked
+            _stale -= 1
+        else:
+            timer._seq = None
+            due.append(timer)
+    for timer in due:
+        if timer.cancelled:  # Cancelled by a timer executed before
+            continue
+        late = time - timer.due
+        data = ev.EventData(timer=timer, late=late)
+        if timer.interval is None:
+            timer.cancelled = True
+            try:
+                ev.source.launch_timer(_EXPIRED, timer.timer_id, data)
+            finally:
+                _forget(timer)
+        else:
+            periods = int(late // timer.interval) + 1
+            timer.due += periods * timer.interval
+            _push(timer)
+            ev.source.launch_timer(_EXPIRED, timer.timer_id, data)
+
+
+def pending():
+    """
+    Return the number of timers that are neither cancelled nor finished,
+    parked ones included
+    """
+    return len(_heap) - _stale + _parked
+
+
+def clear():
+    """Cancel every timer"""
+    global _stale, _parked
+    for _, _, timer in _heap:
+        timer.cancelled = True
+        timer._seq = None
+    for timers in _owners.values():
+        for timer in timers:
+            timer.cancelled = True
+    _heap.clear()
+    _owners.clear()
+    ev.TimerEventListener.listeners[_EXPIRED].clear()
+    ev.TimerEventListener.by_timer[_EXPIRED].clear()
+    _stale = 0
+    _parked = 0
+
+
+def _schedule(timer):
+    """
+    Internal use: add the new 'timer' to the heap, make its EventHandler
+    listen to it and return it
+    """
+    timer.listener = ev.TimerEventListener(timer.event_handler, _EXPIRED,
+                                           timer.timer_id)
+    timer.listener.listen()
+    _push(timer)
+    owner = timer.event_handler.owner
+    if owner is not None:
+        _owners.setdefault(id(owner), set()).add(timer)
+    return timer
+
+
+def _push(timer):
+    """
+    Internal use: add 'timer' to the heap. Only the last entry of a timer
+    (the one with its '_seq') is valid.
+    """
+    timer._seq = next(_order)
+    heapq.heappush(_heap, (timer.due, timer._seq, timer))
+
+
+def _unqueue(timer):
+    """
+    Internal use: invalidate the entry of 'timer' in the heap, if any, and
+    rebuild the heap when too many entries are invalid
+    """
+    global _stale
+    if timer._seq is None:
+        return
+    timer._seq = None
+    _stale += 1
+    if _stale > len(_heap) // 2:
+        _compact()
+
+
+def _forget(timer):
+    """
+    Internal use: stop the Listener of the cancelled or finished 'timer' and
+    remove it from its owner
+    """
+    if timer.listener is not None:
+        timer.listener.ignore()
+        timer.listener = None
+    owner = timer.event_handler.owner
+    timers = _owners.get(id(owner))
+    if timers is not None:
+        timers.discard(timer)
+        if not timers:
+            del _owners[id(owner)]
+
+
+def _compact():
+    """Internal use: rebuild the heap without the invalid entries"""
+    global _stale
+    _heap[:] = [item for item in _heap if item[1] == item[2]._seq]
+    heapq.heapify(_heap)
+    _stale = 0
@@ -9,12 +9,34 @@ All the values will be initialized by the main function at game init.
 - RUNNING: True if the main game loop is iterating, False otherwise;
 - SCREEN_SIZE: size of the window in pixels;
 - SCREEN: main Surface (see pygame docs for Surface), should only be read;
+- HEADLESS: True if the engine runs without a window (see main module docs);
 - FLUSH_COLOR: color with which the SCREEN is filled at refresh;
+- RENDER_MODE: how each frame is drawn on the SCREEN, either 'full' or
+  'dirty' (see engine.render module docs);
+- CAMERA: the active Camera (see engine.camera module docs), through which
+  everything is drawn;
 - CLOCK: the internal clock, should only be read;
 - FRAME_RATE: target frame rate at which the program will run, should only be
   read;
 - DELTA_TIME: time in seconds between each screen update, should only be read;
+- LOOP_MODE: either 'variable' (one update per frame) or 'fixed' (fixed
+  updates at FIXED_RATE, see main module docs);
+- FIXED_RATE: fixed updates per second in the 'fixed' loop mode;
+- FIXED_DELTA_TIME: time in seconds between two fixed updates, should only be
+  read;
+- MAX_FIXED_STEPS: maximum number of fixed updates run in one frame to catch
+  up with the time passed;
+- INTERPOLATION: how far, from 0 to 1, the frame being drawn is between the
+  last fixed update and the next one, should only be read. Renderers can use
+  it to interpolate between the last two simulated positions;
 - FIRST_SCENE: name of the first scene loaded;
+- LOAD_BUDGET: milliseconds per frame spent loading a scene, 0 to load it all
+  at once (see engine.sceneloader module docs);
+- WARM_UP: True if every scene is compiled and cached at startup;
+- PROFILER: True if the frame profiler is enabled at startup (see
+  engine.profiler module docs);
+- PROFILE_COMPONENTS: True if the profiler records the update time of each
+  Component class too;
 - current_scene: not uppercase because it's not a constant. Reference to the
   currently loaded and active Scene (see scenes module docs for Scene)
 - GAME_PATH: Path object (see docs for pathlib for path) containing the path to
@@ -29,13 +51,25 @@ RUNNING = True
 
 SCREEN_SIZE = (600, 400)
 SCREEN = None
+HEADLESS = False
 FLUSH_COLOR = (0, 0, 0)
+RENDER_MODE = 'full'
+CAMERA = None
 
 CLOCK = None
 FRAME_RATE = 60
 DELTA_TIME = 0
+LOOP_MODE = 'variable'
+FIXED_RATE = 60
+FIXED_DELTA_TIME = 1 / 60
+MAX_FIXED_STEPS = 5
+INTERPOLATION = 0
 
 FIRST_SCENE = 'title_scene'
+LOAD_BUDGET = 0
+WARM_UP = False
+PROFILER = False
+PROFILE_COMPONENTS = False
 current_scene = None
 
 GAME_PATH = None
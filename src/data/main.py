@@ -1,28 +1,67 @@
 """
 Main module of the application. If the file is executed directly the main
 function is called, else it has to be called manually.
+
+The engine can also run without a window (headless mode), for example on a
+server or to profile and benchmark scenes: call init_headless() and then drive
+the main loop with step(), which runs a given number of frames as fast as
+possible with a fixed DELTA_TIME, so that every run is reproducible.
+
+The main loop runs in one of two modes (LOOP_MODE):
+- 'variable': every frame the scenes are updated once and drawn, and
+  DELTA_TIME is the time that the last frame took;
+- 'fixed': the simulation runs at a fixed rate (FIXED_RATE), independent from
+  the frame rate. Every frame, before the normal update, as many fixed updates
+  (see Component.on_fixed_update()) as the time passed requires are run, each
+  one simulating FIXED_DELTA_TIME seconds. To avoid spiralling when frames are
+  too slow, at most MAX_FIXED_STEPS are run in a frame and the rest of the
+  time is dropped. What is left, less than a fixed update, is exposed as the
+  INTERPOLATION factor for the renderers.
+
+To start quickly, only the display of pygame is initialized: fonts are
+initialized when the first one is loaded (see engine.assets) and the modules
+that the engine doesn't use (like the mixer) have to be initialized by the
+game. Importing this module doesn't import the YAML parser either: it is
+imported only to read the config file.
+
+If the profiler is enabled (see engine.profiler), the end of every phase of
+the frame is marked: the events, the scene loading, the timers, the fixed
+updates, the update, the rendering, the display update and the wait for the
+next frame. F3 toggles its overlay.
 """
-from ruamel.yaml import YAML
 import pygame
 import traceback
 import pathlib
+import os
 
 import engine
 
+VARIABLE = 'variable'
+FIXED = 'fixed'
+
+_accumulator = 0
+_overlay_rect = None
+
 
 def main():
     """
     Main function. Firstly init the shared variables and then load the first
     scene. Then start the main game loop.
 
-    In the main game loop first flushes the screen, then GameEvents are
-    launched and finally the screen and clock are updated.
+    In the main game loop first GameEvents are launched, then the scene is
+    updated and drawn and finally the screen and clock are updated.
     """
+    print(f"Welcome and thank you for using S2DE v{engine.VERSION}.\n"
+          f"Check out the GitHub repo: {engine.URL}")
     # Init pygame
-    pygame.init()
-    init(__file__)
+    pygame.display.init()
+    init()
     load_config()
-    pygame.display.set_caption(engine.vars.PROGRAM_NAME)
+    if engine.vars.WARM_UP:  # Before the display, the workers are forked
+        warm_up()
+    init_display()
+    if engine.vars.PROFILER:
+        engine.profiler.enable(components=engine.vars.PROFILE_COMPONENTS)
     engine.sceneloader.load_scene(engine.vars.FIRST_SCENE)
     # Main loop
     while engine.vars.RUNNING:
@@ -31,17 +70,52 @@ def main():
     quit()
 
 
-def flush_screen(screen, color):
-    """Fill the 'screen' Surface with a solid color 'color'."""
-    screen.fill(color)
+def init_headless(game_path=None, scene=None):
+    """
+    Init the engine without opening a window and load the scene 'scene'
+    (FIRST_SCENE if None). 'game_path' is the same as in init().
+
+    SDL is switched to its dummy video driver, so the SCREEN is an off-screen
+    Surface and nothing is ever shown. Use step() to run the main loop.
+    """
+    if pygame.display.get_init():
+        pygame.display.quit()
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    pygame.display.init()
+    init(game_path)
+    load_config()
+    init_display(headless=True)
+    if engine.vars.PROFILER:
+        engine.profiler.enable(components=engine.vars.PROFILE_COMPONENTS)
+    if scene is None:
+        scene = engine.vars.FIRST_SCENE
+    engine.sceneloader.load_scene(scene)
 
 
-def init(main_path):
-    """Init global paths, variables and other stuff"""
-    engine.vars.GAME_PATH = pathlib.Path(main_path.replace('main.py', ''))
+def warm_up():
+    """
+    Compile every scene in parallel and cache it (see
+    engine.sceneloader.warm_up()). Print the error of every scene that
+    failed, then raise the first one.
+    """
+    errors = engine.sceneloader.warm_up()
+    for name, error in errors.items():
+        print(f'{name}: {error}')
+    if errors:
+        raise next(iter(errors.values()))
+
+
+def init(game_path=None):
+    """
+    Init global paths, variables and other stuff. 'game_path' is the path of
+    the game directory, the one containing 'config.yaml' and the 'scenes'
+    folder. If None, the directory containing this file is used.
+    """
+    if game_path is None:
+        game_path = pathlib.Path(__file__).resolve().parent
+    engine.vars.GAME_PATH = pathlib.Path(game_path)
     engine.vars.CONFIG_PATH = engine.vars.GAME_PATH.joinpath('config.yaml')
     engine.vars.SCENE_PATH = engine.vars.GAME_PATH.joinpath('scenes')
-    engine.vars.SCREEN = pygame.display.set_mode(engine.vars.SCREEN_SIZE)
     engine.vars.CLOCK = pygame.time.Clock()
 
     del_eh = engine.eventsys.EventHandler(engine.sceneloader.destroy_current)
@@ -49,6 +123,19 @@ def init(main_path):
     engine.eventsys.GameEventListener(del_eh, type_id).listen()
 
 
+def init_display(headless=False):
+    """
+    Create the SCREEN with size SCREEN_SIZE and the Camera. If 'headless' is
+    True, the window is never updated (see init_headless()).
+
+    Called after load_config(), so that the configured values are used.
+    """
+    engine.vars.HEADLESS = headless
+    engine.vars.SCREEN = pygame.display.set_mode(engine.vars.SCREEN_SIZE)
+    engine.vars.CAMERA = engine.Camera()
+    pygame.display.set_caption(engine.vars.PROGRAM_NAME)
+
+
 def load_config():
     """
     Load engine.vars values from 'config.yaml'. If the value is not defined,
@@ -57,6 +144,7 @@ def load_config():
     For info about the variables that can be modified see the docs inside the
     config.yaml file.
     """
+    from ruamel.yaml import YAML
     data = YAML().load(engine.vars.CONFIG_PATH)
     if data is None:
         return
@@ -67,10 +155,43 @@ def load_config():
             engine.vars.SCREEN_SIZE = data[key]
         elif key == 'flush_color':
             engine.vars.FLUSH_COLOR = data[key]
+        elif key == 'render_mode':
+            if data[key] not in (engine.render.FULL, engine.render.DIRTY):
+                raise ValueError(f'Invalid value {data[key]} for {key} in '
+                                 'config file')
+            engine.vars.RENDER_MODE = data[key]
+        elif key == 'static_layers':
+            for layer in data[key]:
+                engine.render.set_static(layer)
         elif key == 'frame_rate':
             engine.vars.FRAME_RATE = data[key]
+        elif key == 'loop_mode':
+            if data[key] not in (VARIABLE, FIXED):
+                raise ValueError(f'Invalid value {data[key]} for {key} in '
+                                 'config file')
+            engine.vars.LOOP_MODE = data[key]
+        elif key == 'fixed_rate':
+            engine.vars.FIXED_RATE = data[key]
+            engine.vars.FIXED_DELTA_TIME = 1 / data[key]
+        elif key == 'max_fixed_steps':
+            engine.vars.MAX_FIXED_STEPS = data[key]
         elif key == 'first_scene':
             engine.vars.FIRST_SCENE = data[key]
+        elif key == 'load_budget':
+            engine.vars.LOAD_BUDGET = data[key]
+        elif key == 'scene_cache_size':
+            engine.sceneloader.SceneCache.cache_size = data[key]
+        elif key == 'scene_cache_bytes':
+            engine.sceneloader.SceneCache.max_bytes = data[key]
+        elif key == 'warm_up':
+            engine.vars.WARM_UP = data[key]
+        elif key == 'pinned_scenes':
+            for name in data[key]:
+                engine.sceneloader.SceneCache.pin(name)
+        elif key == 'profiler':
+            engine.vars.PROFILER = data[key]
+        elif key == 'profile_components':
+            engine.vars.PROFILE_COMPONENTS = data[key]
         else:
             raise ValueError(f'Invalid key {key} in config file')
 
@@ -84,6 +205,8 @@ def call_event_loop():
         data = None
         key = None
         if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F3 and engine.profiler.enabled:
+                engine.profiler.toggle_overlay()
             key = engine.eventsys.GameEventListener.KEYDOWN
             data = engine.eventsys.EventData(unicode=event.unicode,
                                              key=event.key,
@@ -117,15 +240,106 @@ def call_event_loop():
 
 
 def update():
-    """Updates the contents of the window if a scene exists"""
-    flush_screen(engine.vars.SCREEN, engine.vars.FLUSH_COLOR)
-    try:
-        engine.vars.current_scene.update()
-        pygame.display.update()
+    """
+    Updates the contents of the window if a scene exists. Depending on the
+    render mode, either the whole window or only the changed regions are
+    updated.
+
+    Before updating, finished scene preloads and transitions are handled (see
+    engine.sceneloader.poll()) and the due timers are executed (see
+    engine.timers). Then the clock waits for the next frame (see
+    run_frame()).
+    """
+    run_frame(tick=True, display=not engine.vars.HEADLESS)
+
+
+def run_frame(tick, display):
+    """
+    Run the body of a frame, after the GameEvent loop: handle the scene
+    loading and the timers, then, if a scene exists, run the fixed updates (in
+    the 'fixed' loop mode), update the scenes and draw them. If 'display' is
+    True the window is updated; if 'tick' is True DELTA_TIME is set to the
+    time the last frame took and the clock waits for the next frame. Used by
+    both update() and step().
+    """
+    engine.profiler.mark('events')
+    engine.sceneloader.poll()
+    engine.profiler.mark('poll')
+    engine.timers.advance()
+    engine.profiler.mark('timers')
+    if engine.vars.current_scene is not None:
+        if engine.vars.LOOP_MODE == FIXED:
+            fixed_update()
+            engine.profiler.mark('fixed_update')
+        engine.sceneloader.update_scenes()
+        engine.profiler.mark('update')
+        draw(display)
+    if tick:
         engine.vars.DELTA_TIME = engine.vars.CLOCK.get_time() / 1000
         engine.vars.CLOCK.tick(engine.vars.FRAME_RATE)
-    except AttributeError:
+        engine.profiler.mark('tick')
+    engine.profiler.end_frame()
+
+
+def fixed_update():
+    """
+    Run the fixed updates needed to simulate the DELTA_TIME passed, at most
+    MAX_FIXED_STEPS (dropping the rest of the time), and update the
+    INTERPOLATION factor.
+    """
+    global _accumulator
+    step_time = engine.vars.FIXED_DELTA_TIME
+    _accumulator += engine.vars.DELTA_TIME
+    steps = 0
+    while _accumulator >= step_time and steps < engine.vars.MAX_FIXED_STEPS:
+        engine.sceneloader.fixed_update_scenes()
+        _accumulator -= step_time
+        steps += 1
+    if _accumulator >= step_time:
+        _accumulator %= step_time
+    engine.vars.INTERPOLATION = _accumulator / step_time
+
+
+def draw(display=True):
+    """
+    Draw the frame on the SCREEN, with the profiler overlay if shown, and
+    update the window if 'display' is True. The region covered by the
+    overlay in the last frame is drawn again, so what it doesn't cover
+    anymore is cleared.
+    """
+    global _overlay_rect
+    if _overlay_rect is not None:
+        engine.render.damage(_overlay_rect)
+    dirty = engine.render.flush(engine.vars.SCREEN)
+    _overlay_rect = engine.profiler.draw_overlay(engine.vars.SCREEN)
+    if _overlay_rect is not None and dirty is not None:
+        dirty.append(_overlay_rect)
+    engine.profiler.mark('render')
+    if not display:
         return
+    if dirty is None:
+        pygame.display.update()
+    else:
+        pygame.display.update(dirty)
+    engine.profiler.mark('display')
+
+
+def step(frames=1, delta_time=None):
+    """
+    Run 'frames' iterations of the main loop without waiting between them.
+    DELTA_TIME is fixed to 'delta_time' seconds (1 / FRAME_RATE if None), so
+    the simulation doesn't depend on how fast the frames really are.
+
+    Stop early if the loop stops running (for example on QUIT).
+    """
+    if delta_time is None:
+        delta_time = 1 / engine.vars.FRAME_RATE
+    for _ in range(frames):
+        if not engine.vars.RUNNING:
+            return
+        engine.vars.DELTA_TIME = delta_time
+        call_event_loop()
+        run_frame(tick=False, display=not engine.vars.HEADLESS)
 
 
 def quit():
@@ -133,6 +347,7 @@ def quit():
     del_eh = engine.eventsys.EventHandler(engine.sceneloader.destroy_current)
     type_id = engine.eventsys.GameEventListener.QUIT
     engine.eventsys.GameEventListener(del_eh, type_id).ignore()
+    engine.sceneloader.shutdown()
     pygame.quit()
 
 # If executed directly, call the main function
@@ -5,6 +5,8 @@ the main loop running.
 Left kind of barren because this is a module that most likely the user will
 expand to add his own tests.
 """
+import time
+
 import engine
 import components
 # import behaviours
@@ -28,3 +30,31 @@ def create_dummy_go(name, spawn):
     go = engine.gameobject.GameObject(name, [components.Transform()])
     if spawn:
         go.spawn()
+
+
+def test_scene_cache(name='title_scene', times=1000):
+    """
+    Load the scene 'name' 'times' times with a cold cache (emptied before each
+    load) and then 'times' times with a warm one, checking that every load
+    creates the same GameObjects. Return a tuple with the total seconds taken
+    by the cold and by the warm loads.
+
+    engine.vars.SCENE_PATH must be set (see main.init()).
+    """
+    cache = engine.sceneloader.SceneCache
+    expected = None
+    timings = []
+    for cold in (True, False):
+        start = time.perf_counter()
+        for _ in range(times):
+            if cold:
+                cache.clear()
+            engine.sceneloader.load_scene(name)
+            names = [go.name for go in
+                     engine.vars.current_scene.gameobject_instances()]
+            if expected is None:
+                expected = names
+            assert names == expected, f'scene {name} changed after a load'
+        timings.append(time.perf_counter() - start)
+        engine.sceneloader.destroy_current()
+    return tuple(timings)